@@ -0,0 +1,10 @@
+"""Reproducible performance benchmarks for the portal's queries.
+
+    python -m benchmarks.generate --submissions 200000 --seed 42   # synthetic dataset
+    python -m benchmarks.run --output results.json                 # timed scenarios
+    python -m benchmarks.run --compare baseline.json               # fail on regressions
+
+Both commands use the normal DB_* settings (environment or secrets) and refuse to
+touch a database whose name does not contain "bench" unless ``--force`` is given.
+See README.md ("Performance Benchmarks") for running Postgres in a container.
+"""
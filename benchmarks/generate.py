@@ -0,0 +1,202 @@
+"""Seeded synthetic dataset for the benchmarks.
+
+Creates/upgrades the schema with ``database_setup.setup_database()``, replaces every
+row of ``school_submissions`` with ``--submissions`` generated submissions spread over
+the 17 LGAs (about a quarter of them resubmissions of an earlier school), links them
+to ``schools``, then rebuilds the LGA aggregates and ranking snapshot exactly as the
+app would. The same ``--seed`` and ``--as-of`` date always produce the same rows;
+``--as-of`` defaults to today so the dashboard's 7-day window has data.
+
+Rows are generated in Python and loaded with ``COPY ... FROM STDIN`` in batches, so
+2M submissions take minutes rather than hours.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from sqlalchemy import text
+
+import database_setup
+from portal import db
+from portal.aggregates import rebuild_lga_aggregates
+from portal.config import get_setting
+from portal.facilities import FACILITIES, FACILITY_BITS
+from portal.schools import link_submissions
+
+BATCH_ROWS = 50_000
+
+# Share of all schools per LGA (roughly by population; cities weigh more)
+LGA_WEIGHTS = {
+    "Aba North": 9, "Aba South": 10, "Arochukwu": 5, "Bende": 6, "Ikwuano": 4,
+    "Isiala Ngwa North": 6, "Isiala Ngwa South": 5, "Isuikwuato": 4, "Obi Ngwa": 7,
+    "Ohafia": 7, "Osisioma": 7, "Ugwunagbo": 4, "Ukwa East": 3, "Ukwa West": 4,
+    "Umuahia North": 8, "Umuahia South": 5, "Umu Nneochi": 4,
+}
+URBAN_LGAS = {"Aba North", "Aba South", "Umuahia North", "Umuahia South", "Osisioma"}
+
+# Probability that a school has each facility, before the urban/rural adjustment
+FACILITY_RATES = {
+    "boys_toilet": 0.65, "girls_toilet": 0.60, "water": 0.45, "electricity": 0.35,
+    "desks": 0.70, "fencing": 0.40, "classrooms": 0.55, "ict_lab": 0.12,
+}
+URBAN_FACTOR = 1.3
+RURAL_FACTOR = 0.8
+
+# approved = TRUE / FALSE / NULL (pending)
+STATUS_WEIGHTS = ((True, 70), (False, 10), (None, 20))
+# Share of rows that are a later submission (next term) of an already generated school
+RESUBMIT_RATE = 0.25
+
+NAME_PREFIXES = ["Community", "Central", "Model", "Township", "St. Mary's", "St. Paul's", "Holy Rosary",
+                 "Government", "Comprehensive", "Christ the King", "Methodist", "Anglican", "Ibeku", "Ngwa"]
+NAME_KINDS = ["Primary School", "Secondary School", "Girls' Secondary School", "Boys' High School",
+              "Technical College", "Nursery & Primary School"]
+FIRST_NAMES = ["Chinedu", "Ngozi", "Emeka", "Adaeze", "Obinna", "Chiamaka", "Ikenna", "Uchenna",
+               "Nkechi", "Kelechi", "Ifeoma", "Chukwuemeka", "Amaka", "Okechukwu"]
+LAST_NAMES = ["Okafor", "Nwosu", "Eze", "Okeke", "Uche", "Nwankwo", "Onyekachi", "Ibe", "Kalu", "Agwu"]
+
+COPY_COLUMNS = ("school_name", "lga_name", "lga_key", "enrollment_total", "teachers_total", "submitted_by",
+                "email", "submitted_at", "approved", "facilities", "facilities_mask")
+
+LABELS = dict(FACILITIES)
+
+
+def check_target(force):
+    """Exit unless the configured database is clearly a benchmark database."""
+    name = get_setting("DB_NAME") if db.get_database_url() else None
+    if not name:
+        sys.exit("Missing database credentials (DB_USER, DB_PASSWORD, DB_HOST, DB_NAME).")
+    if "bench" not in name.lower() and not force:
+        sys.exit(f"Refusing to overwrite database '{name}': its name does not contain 'bench' (use --force).")
+
+
+def generate_rows(n, seed, lgas, as_of, days=365):
+    """Yield ``n`` submission tuples in ``COPY_COLUMNS`` order, submitted during the
+    ``days`` before ``as_of``. ``lgas`` maps name -> lga_key."""
+    rng = random.Random(seed)
+    now = datetime.combine(as_of, dt_time())
+    names = sorted(lgas)
+    weights = [LGA_WEIGHTS.get(name, 5) for name in names]
+    statuses = [s for s, _ in STATUS_WEIGHTS]
+    status_weights = [w for _, w in STATUS_WEIGHTS]
+
+    school_lgas = bytearray()  # LGA index of every generated school, for resubmissions
+
+    for i in range(n):
+        if school_lgas and rng.random() < RESUBMIT_RATE:
+            school = rng.randrange(len(school_lgas))
+        else:
+            school = len(school_lgas)
+            school_lgas.append(rng.choices(range(len(names)), weights)[0])
+        lga = names[school_lgas[school]]
+        factor = URBAN_FACTOR if lga in URBAN_LGAS else RURAL_FACTOR
+        keys = [key for key, rate in FACILITY_RATES.items() if rng.random() < min(rate * factor, 0.95)]
+        mask = 0
+        for key in keys:
+            mask |= FACILITY_BITS[key]
+        enrollment = max(20, int(rng.lognormvariate(5.8, 0.6)))
+        teachers = max(1, round(enrollment / rng.uniform(25, 60)))
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield (
+            f"{NAME_PREFIXES[school % len(NAME_PREFIXES)]} "
+            f"{NAME_KINDS[school // len(NAME_PREFIXES) % len(NAME_KINDS)]} {school + 1}, {lga}",
+            lga,
+            lgas[lga],
+            enrollment,
+            teachers,
+            f"{first} {last}",
+            f"{first}.{last}{i}@example.org".lower(),
+            (now - timedelta(seconds=rng.randrange(days * 86400))).isoformat(sep=" "),
+            rng.choices(statuses, status_weights)[0],
+            json.dumps([LABELS[key] for key in keys]),
+            mask,
+        )
+
+
+def _csv_batch(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        # NULL is an unquoted empty field in COPY's CSV format
+        writer.writerow(["" if v is None else v for v in row])
+    return io.BytesIO(buf.getvalue().encode("utf-8"))
+
+
+def load(engine, n, seed, as_of):
+    with engine.connect() as conn:
+        lgas = dict(conn.execute(text("SELECT lga_name, lga_key FROM dwh.dim_lga")).fetchall())
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("TRUNCATE school_submissions, schools, dwh.lga_ranking_snapshot RESTART IDENTITY")
+        copy_sql = f"COPY school_submissions ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+        batch, loaded, start = [], 0, time.perf_counter()
+        for row in generate_rows(n, seed, lgas, as_of):
+            batch.append(row)
+            if len(batch) == BATCH_ROWS:
+                cursor.execute(copy_sql, stream=_csv_batch(batch))
+                loaded += len(batch)
+                batch = []
+                print(f"  {loaded:,} rows ({loaded / (time.perf_counter() - start):,.0f} rows/s)")
+        if batch:
+            cursor.execute(copy_sql, stream=_csv_batch(batch))
+            loaded += len(batch)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with engine.begin() as conn:
+        link_submissions(conn)
+        rebuild_lga_aggregates(conn)
+    vacuum_analyze(engine, "school_submissions", "schools")
+    return loaded
+
+
+def vacuum_analyze(engine, *tables):
+    """VACUUM cannot run in a transaction, and the pool's pre-ping has already opened
+    one on a checked-out connection, so end it and switch the driver to autocommit."""
+    raw = engine.raw_connection()
+    try:
+        driver = raw.driver_connection
+        driver.rollback()
+        driver.autocommit = True
+        try:
+            cursor = driver.cursor()
+            for table in tables:
+                cursor.execute(f"VACUUM ANALYZE {table}")
+        finally:
+            driver.autocommit = False
+    finally:
+        raw.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill a benchmark database with a synthetic Abia dataset.")
+    parser.add_argument("--submissions", type=int, default=20_000, help="rows to generate (2k to 2M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="newest submission date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--skip-setup", action="store_true", help="assume the schema is already up to date")
+    parser.add_argument("--force", action="store_true", help="allow a database name without 'bench'")
+    args = parser.parse_args(argv)
+
+    check_target(args.force)
+    # Bulk load, aggregate rebuild and VACUUM legitimately run past the app's statement timeout
+    os.environ.setdefault("DB_STATEMENT_TIMEOUT_MS", "0")
+    if not args.skip_setup:
+        database_setup.setup_database()
+    print(f"Generating {args.submissions:,} submissions (seed {args.seed})...")
+    start = time.perf_counter()
+    loaded = load(db.get_engine(), args.submissions, args.seed, args.as_of)
+    print(f"Loaded {loaded:,} submissions in {time.perf_counter() - start:,.1f}s")
+
+
+if __name__ == "__main__":
+    main()
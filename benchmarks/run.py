@@ -0,0 +1,157 @@
+"""Run the benchmark scenarios, write JSON results, and compare against a baseline.
+
+    python -m benchmarks.run --repeat 10 --output results/after.json
+    python -m benchmarks.run --compare results/before.json --threshold 0.2
+
+A scenario regresses when its median is more than ``--threshold`` (fraction)
+slower than in the baseline; the command then exits with status 1, so it can gate
+CI. Medians are compared because single runs on a shared machine are noisy. A
+scenario that raises is recorded with its error and the run goes on to the next
+one; the report is still written, and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from portal import db
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def environment(engine):
+    with engine.connect() as conn:
+        server = conn.execute(text("SHOW server_version")).scalar()
+        submissions = conn.execute(text("SELECT COUNT(*) FROM school_submissions")).scalar()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "postgres": server,
+        "host": platform.node(),
+        "submissions": submissions,
+    }
+
+
+def run_scenario(func, engine, repeat, warmup):
+    for _ in range(warmup):
+        func(engine)
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(engine)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "result": result,
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(_percentile(timings, 95), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def run_all(scenarios, engine, names, repeat, warmup):
+    """Run ``names`` from ``scenarios``; a failing scenario is recorded as ``{"error": ...}``."""
+    results = {}
+    for name in names:
+        try:
+            stats = run_scenario(scenarios[name], engine, repeat, warmup)
+        except Exception as e:
+            traceback.print_exc()
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:<28} FAILED   {results[name]['error']}")
+            continue
+        results[name] = stats
+        print(f"{name:<28} median {stats['median_ms']:>9.1f} ms   p95 {stats['p95_ms']:>9.1f} ms   result {stats['result']}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table; return the names of regressed scenarios."""
+    regressed = []
+    print(f"\n{'scenario':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if "error" in current:
+            print(f"{name:<28}{'-':>12}{'-':>12}{'error':>10}")
+            continue
+        if not before or "error" in before:
+            print(f"{name:<28}{'-':>12}{current['median_ms']:>11.1f}ms{'new':>10}")
+            continue
+        change = (current["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{before['median_ms']:>10.1f}ms{current['median_ms']:>10.1f}ms{change:>+10.0%}{flag}")
+    if baseline.get("environment", {}).get("submissions") != results["environment"]["submissions"]:
+        print("\nNote: baseline was measured on a different dataset size.")
+    return regressed
+
+
+def main(argv=None):
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Time the portal's data paths against a benchmark database.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed median slowdown before failing, as a fraction (default 0.2)")
+    args = parser.parse_args(argv)
+
+    # Scenarios time whole code paths; a 2M-row export may exceed the app's statement timeout
+    os.environ.setdefault("DB_STATEMENT_TIMEOUT_MS", "0")
+    engine = db.get_engine()
+    if engine is None:
+        sys.exit("Missing database credentials (DB_USER, DB_PASSWORD, DB_HOST, DB_NAME).")
+
+    results = {"environment": environment(engine), "scenarios": {}}
+    print(f"{results['environment']['submissions']:,} submissions • PostgreSQL {results['environment']['postgres']}")
+    results["scenarios"] = run_all(SCENARIOS, engine, args.scenario or list(SCENARIOS), args.repeat, args.warmup)
+    failed = [name for name, stats in results["scenarios"].items() if "error" in stats]
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    regressed = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressed = compare(results, json.load(f), args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} scenario(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+    if failed:
+        print(f"\n{len(failed)} scenario(s) failed: {', '.join(failed)}")
+    if regressed or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
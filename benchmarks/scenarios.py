@@ -0,0 +1,155 @@
+"""Timed benchmark scenarios, one per user-facing data path.
+
+Each scenario takes the engine and returns the number of rows (or bytes) it
+produced, so results also show when a change alters what a query returns. The
+scenarios call the same functions the pages use, uncached: the point is to time the
+database work, not Streamlit's cache. Write scenarios run inside a transaction that
+is rolled back, so the dataset is identical for every repetition.
+"""
+import csv
+import io
+from datetime import timedelta
+from functools import lru_cache
+
+from sqlalchemy import text
+
+from portal.aggregates import set_submission_status
+from portal.bulk_import import import_rows
+from portal.dashboard import compute_dashboard
+from portal.export import export_query
+from portal.kpis import compute_kpis
+from portal.lookup import browse_page, search_page
+from portal.ranking import read_latest_ranking, refresh_ranking_snapshot
+from portal.submissions_query import (
+    SubmissionFilter, count_submissions, export_statement, fetch_page, submission_date_bounds,
+)
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def _lga_keys(engine, n):
+    with engine.connect() as conn:
+        return [r[0] for r in conn.execute(text("SELECT lga_key FROM dwh.dim_lga ORDER BY lga_key LIMIT :n"), {"n": n})]
+
+
+@lru_cache(maxsize=None)
+def _filter(engine):
+    """A typical Request Data filter: three LGAs, approved, the last 90 days (built once)."""
+    _first, last = submission_date_bounds(engine)
+    return SubmissionFilter(lga_keys=_lga_keys(engine, 3), statuses=["Approved"],
+                            start_date=last - timedelta(days=90), end_date=last)
+
+
+@scenario("live_dashboard")
+def live_dashboard(engine):
+    data = compute_dashboard(engine)
+    return len(data["lgas"]) + len(data["facilities"]) + len(data["recent"])
+
+
+@scenario("home_kpis")
+def home_kpis(engine):
+    compute_kpis(engine)
+    return 1
+
+
+@scenario("transparency_ranking")
+def transparency_ranking(engine):
+    return len(read_latest_ranking(engine))
+
+
+@scenario("ranking_snapshot")
+def ranking_snapshot(engine):
+    with engine.connect() as conn:
+        with conn.begin() as tx:
+            refresh_ranking_snapshot(conn)
+            tx.rollback()
+    return 17
+
+
+@scenario("request_data_filter")
+def request_data_filter(engine):
+    flt = _filter(engine)
+    total = count_submissions(engine, flt)
+    df, cursor = fetch_page(engine, flt)
+    # Deep page: walk to the fifth page through the keyset cursor
+    for _ in range(4):
+        if cursor is None:
+            break
+        df, cursor = fetch_page(engine, flt, cursor=cursor)
+    return total
+
+
+@scenario("request_data_keyword")
+def request_data_keyword(engine):
+    flt = SubmissionFilter(keyword="okafor")
+    count_submissions(engine, flt)
+    df, _cursor = fetch_page(engine, flt)
+    return len(df)
+
+
+@scenario("request_data_export_csv")
+def request_data_export_csv(engine):
+    return len(export_query(engine, *export_statement(_filter(engine)), fmt="csv"))
+
+
+@scenario("school_lookup_browse")
+def school_lookup_browse(engine):
+    df, cursor = browse_page(engine)
+    for _ in range(9):
+        if cursor is None:
+            break
+        df, cursor = browse_page(engine, cursor)
+    return len(df)
+
+
+@scenario("school_lookup_search")
+def school_lookup_search(engine):
+    rows = 0
+    for term in ("community primary", "aba north", "st marys", "technical colege"):
+        df, _has_next = search_page(engine, term)
+        rows += len(df)
+    return rows
+
+
+@scenario("bulk_approve_50")
+def bulk_approve_50(engine):
+    with engine.connect() as conn:
+        with conn.begin() as tx:
+            ids = [r[0] for r in conn.execute(text(
+                "SELECT id FROM school_submissions WHERE approved IS NULL ORDER BY submitted_at DESC, id DESC LIMIT 50"
+            ))]
+            changed = set_submission_status(conn, ids, True)
+            tx.rollback()
+    return len(changed)
+
+
+@lru_cache(maxsize=None)
+def _census_csv(engine, n):
+    """A census file of ``n`` rows spread over every LGA, every tenth row invalid (built once)."""
+    with engine.connect() as conn:
+        lgas = [r[0] for r in conn.execute(text("SELECT lga_name FROM dwh.dim_lga ORDER BY lga_name"))]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["school_name", "lga", "students", "teachers", "email", "facilities"])
+    for i in range(n):
+        students = "unknown" if i % 10 == 9 else 100 + i % 900
+        writer.writerow([f"Census School {i}", lgas[i % len(lgas)], students, 5 + i % 40,
+                         f"school{i}@example.org", "Water; Electricity" if i % 3 else ""])
+    return buf.getvalue().encode("utf-8")
+
+
+@scenario("bulk_import_5000")
+def bulk_import_5000(engine):
+    data = _census_csv(engine, 5000)
+    with engine.connect() as conn:
+        with conn.begin() as tx:
+            result = import_rows(conn, "census.csv", io.BytesIO(data), "benchmark", approve=True)
+            tx.rollback()
+    return result.rows_imported
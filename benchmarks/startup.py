@@ -0,0 +1,131 @@
+"""Measure worker cold start and per-rerun overhead of the Streamlit app.
+
+    python -m benchmarks.startup --repeat 5 --output startup.json
+
+Two measurements:
+
+* imports — each module is imported in a fresh interpreter, so the time is what a
+  new worker pays. ``app`` is the shared shell (Streamlit, the sidebar menu,
+  portal.db, views); every ``views.<page>`` row is measured on top of that shell
+  and lists the heavy libraries (plotly, PIL, ...) the page pulls in.
+* runs — ``app.py`` is executed through ``AppTest`` once per page (``?page=``
+  deep link): the first run includes importing the page, later reruns show the
+  steady-state cost of a script rerun. Needs a database only for pages that
+  query it; without one they render their error message and still time the shell.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from views import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+SHELL_MODULES = ("streamlit", "streamlit_option_menu", "portal.db", "portal.querylog", "views")
+HEAVY_MODULES = ("plotly", "PIL", "xlsxwriter", "openpyxl", "pyarrow", "smtplib", "email.mime")
+
+# Runs in a fresh interpreter: import the base modules, then time the target
+_PROBE = """
+import importlib, json, sys, time
+base, target, heavy = sys.argv[1].split(","), sys.argv[2], sys.argv[3].split(",")
+start = time.perf_counter()
+for name in base:
+    if name:
+        importlib.import_module(name)
+base_s = time.perf_counter() - start
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module(target)
+print(json.dumps({
+    "base_ms": base_s * 1000,
+    "import_ms": (time.perf_counter() - start) * 1000,
+    "new_modules": len(set(sys.modules) - before),
+    "heavy": sorted(h for h in heavy if h in sys.modules and h not in before),
+}))
+"""
+
+
+def probe_import(target, base=()):
+    out = subprocess.check_output(
+        [sys.executable, "-c", _PROBE, ",".join(base), target, ",".join(HEAVY_MODULES)],
+        cwd=ROOT, text=True, stderr=subprocess.DEVNULL,
+    )
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure_imports(repeat):
+    results = {}
+    targets = [("app", name, ()) for name in SHELL_MODULES]
+    targets += [(page, module, SHELL_MODULES) for page, module in PAGES.items()]
+    for label, module, base in targets:
+        samples = [probe_import(module, base) for _ in range(repeat)]
+        key = module if label == "app" else label
+        results[key] = {
+            "module": module,
+            "median_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+            "new_modules": samples[-1]["new_modules"],
+            "heavy": samples[-1]["heavy"],
+        }
+    return results
+
+
+def measure_runs(repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page in PAGES:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        at.query_params["page"] = page
+        if page == "Admin Panel":
+            at.session_state["admin"] = True
+        start = time.perf_counter()
+        at.run()
+        first = (time.perf_counter() - start) * 1000
+        reruns = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            reruns.append((time.perf_counter() - start) * 1000)
+        results[page] = {
+            "first_ms": round(first, 1),
+            "rerun_median_ms": round(statistics.median(reruns), 1),
+            "errors": len(at.exception),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time cold imports and script reruns of the portal app.")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per import / reruns per page")
+    parser.add_argument("--timeout", type=float, default=60, help="AppTest run timeout in seconds")
+    parser.add_argument("--skip-runs", action="store_true", help="only measure imports")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    # The metrics endpoint and e-mail sender are not part of what is being measured
+    os.environ["METRICS_PORT"] = "0"
+    os.environ["EMAIL_SENDER_IN_APP"] = "false"
+
+    report = {"python": sys.version.split()[0], "imports": measure_imports(args.repeat)}
+    print(f"{'import':<34}{'median':>10}{'modules':>9}  heavy")
+    for name, r in report["imports"].items():
+        print(f"{name:<34}{r['median_ms']:>8.0f}ms{r['new_modules']:>9}  {', '.join(r['heavy']) or '-'}")
+
+    if not args.skip_runs:
+        report["runs"] = measure_runs(args.repeat, args.timeout)
+        print(f"\n{'page':<34}{'first run':>12}{'rerun p50':>12}")
+        for page, r in report["runs"].items():
+            print(f"{page:<34}{r['first_ms']:>10.0f}ms{r['rerun_median_ms']:>10.0f}ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
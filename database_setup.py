@@ -1,6 +1,13 @@
+import argparse
+import csv
 import os
 import sqlalchemy
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+
+from portal import db
+from portal.aggregates import rebuild_lga_aggregates
+from portal.facilities import FACILITY_KEYS, count_column, mask_from_text_sql
+from portal.schools import link_submissions
 
 # Define the 17 LGAs of Abia State
 ABIA_LGAS = [
@@ -11,20 +18,38 @@ ABIA_LGAS = [
 ]
 
 def get_database_url():
-    # Check for environment variables or secrets
-    # This allows it to run locally if env vars are set, or you can manually replace this string
-    db_user = os.getenv("DB_USER")
-    db_password = os.getenv("DB_PASSWORD")
-    db_host = os.getenv("DB_HOST")
-    db_port = os.getenv("DB_PORT", "5432")
-    db_name = os.getenv("DB_NAME")
-    
-    if not all([db_user, db_password, db_host, db_name]):
+    # Credentials come from environment variables or .streamlit/secrets.toml (see portal/config.py)
+    url = db.get_database_url()
+    if not url:
         print("❌ Error: Missing database credentials.")
         print("Please ensure DB_USER, DB_PASSWORD, DB_HOST, and DB_NAME are set in your environment or secrets.")
         return None
         
-    return f"postgresql+pg8000://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    return url
+
+LEGACY_ADMIN_LOG = "admin_activity_log.csv"
+
+def import_legacy_admin_log(conn):
+    # One-time copy of the old CSV activity log into admin_audit_log (only into an empty table)
+    if not os.path.exists(LEGACY_ADMIN_LOG):
+        return
+    if conn.execute(text("SELECT EXISTS (SELECT 1 FROM admin_audit_log)")).scalar():
+        return
+    with open(LEGACY_ADMIN_LOG, newline="", encoding="utf-8") as f:
+        rows = [{
+            "logged_at": row.get("timestamp"),
+            "admin": row.get("admin") or "admin",
+            "action": row.get("action") or "UNKNOWN",
+            "submission_id": int(row["submission_id"]) if (row.get("submission_id") or "").isdigit() else None,
+            "school_name": row.get("school_name"),
+            "lga_name": row.get("lga_name"),
+        } for row in csv.DictReader(f)]
+    if rows:
+        conn.execute(text("""
+            INSERT INTO admin_audit_log (logged_at, admin, action, submission_id, school_name, lga_name)
+            VALUES (CAST(:logged_at AS TIMESTAMPTZ), :admin, :action, :submission_id, :school_name, :lga_name)
+        """), rows)
+    print(f"Imported {len(rows)} entries from {LEGACY_ADMIN_LOG}")
 
 def setup_database():
     url = get_database_url()
@@ -33,7 +58,7 @@ def setup_database():
 
     print(f"🔌 Connecting to database...")
     try:
-        engine = create_engine(url)
+        engine = db.get_engine()
         with engine.begin() as conn:
             # 1. Create Schema
             print("Creating schema 'dwh'...")
@@ -59,7 +84,7 @@ def setup_database():
                     teachers_total INTEGER DEFAULT 0,
                     submitted_by VARCHAR(100),
                     email VARCHAR(100),
-                    submitted_at TIMESTAMP DEFAULT NOW(),
+                    submitted_at TIMESTAMP NOT NULL DEFAULT NOW(),
                     approved BOOLEAN DEFAULT NULL
                 );
             """))
@@ -83,11 +108,267 @@ def setup_database():
                     VALUES (:lga) 
                     ON CONFLICT (lga_name) DO NOTHING;
                 """), {"lga": lga})
+
+            # 6. Submission columns used by the app (facilities checklist, proof photo)
+            print("Upgrading table 'school_submissions'...")
+            conn.execute(text("""
+                ALTER TABLE school_submissions
+                    ADD COLUMN IF NOT EXISTS facilities JSONB,
+                    ADD COLUMN IF NOT EXISTS photo_path TEXT,
+                    ADD COLUMN IF NOT EXISTS thumb_path TEXT;
+            """))
+
+            # 7. Resolved LGA foreign key so rollups join on an indexed integer
+            print("Backfilling 'school_submissions.lga_key'...")
+            conn.execute(text("""
+                ALTER TABLE school_submissions
+                    ADD COLUMN IF NOT EXISTS lga_key INTEGER REFERENCES dwh.dim_lga(lga_key);
+            """))
+            conn.execute(text("""
+                UPDATE school_submissions s
+                SET lga_key = l.lga_key
+                FROM dwh.dim_lga l
+                WHERE s.lga_key IS NULL
+                  AND TRIM(UPPER(l.lga_name)) = TRIM(UPPER(s.lga_name));
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_approved_lga
+                    ON school_submissions (approved, lga_key);
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_verified_lga
+                    ON school_submissions (lga_key)
+                    INCLUDE (enrollment_total, teachers_total)
+                    WHERE approved = TRUE;
+            """))
+            # Keyset paging compares (submitted_at, id), which a NULL would break. Rows
+            # without a timestamp get the oldest one on record so they page last.
+            conn.execute(text("""
+                UPDATE school_submissions
+                SET submitted_at = COALESCE(
+                    (SELECT MIN(submitted_at) FROM school_submissions), NOW())
+                WHERE submitted_at IS NULL;
+            """))
+            conn.execute(text("""
+                ALTER TABLE school_submissions ALTER COLUMN submitted_at SET NOT NULL;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_submitted
+                    ON school_submissions (submitted_at DESC, id DESC);
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_verified_name
+                    ON school_submissions (school_name, id)
+                    WHERE approved = TRUE;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_pending
+                    ON school_submissions (submitted_at DESC)
+                    WHERE approved IS NULL;
+            """))
+
+            # 8. Facilities as a bitmask (one bit per option in portal/facilities.py)
+            print("Backfilling 'school_submissions.facilities_mask'...")
+            conn.execute(text("""
+                ALTER TABLE school_submissions
+                    ADD COLUMN IF NOT EXISTS facilities_mask SMALLINT NOT NULL DEFAULT 0;
+            """))
+            conn.execute(text(f"""
+                UPDATE school_submissions
+                SET facilities_mask = {mask_from_text_sql("facilities")}
+                WHERE facilities_mask = 0 AND facilities IS NOT NULL;
+            """))
+
+            # 9. Per-LGA aggregate columns (maintained incrementally on approve/reject)
+            print("Upgrading table 'dwh.fact_abia_metrics'...")
+            facility_columns = "".join(
+                f"ADD COLUMN IF NOT EXISTS {count_column(key)} INTEGER NOT NULL DEFAULT 0, "
+                for key in FACILITY_KEYS
+            )
+            conn.execute(text(f"""
+                ALTER TABLE dwh.fact_abia_metrics
+                    ADD COLUMN IF NOT EXISTS school_count INTEGER NOT NULL DEFAULT 0,
+                    ADD COLUMN IF NOT EXISTS submission_count INTEGER NOT NULL DEFAULT 0,
+                    {facility_columns}
+                    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+            """))
+
+            # 10. Outbound email queue (drained by portal/mailer.py)
+            print("Creating table 'email_outbox'...")
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS email_outbox (
+                    id BIGSERIAL PRIMARY KEY,
+                    to_email VARCHAR(255) NOT NULL,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    status VARCHAR(10) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    locked_at TIMESTAMP,
+                    last_error TEXT,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    sent_at TIMESTAMP
+                );
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_outbox_due
+                    ON email_outbox (next_attempt_at)
+                    WHERE status IN ('pending', 'sending');
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_outbox_sent_at
+                    ON email_outbox (sent_at)
+                    WHERE status = 'sent';
+            """))
+
+            # 11. Trigram indexes for School Lookup / Request Data keyword search
+            print("Creating search indexes (pg_trgm)...")
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+            for column in ("school_name", "lga_name", "submitted_by", "email"):
+                conn.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS idx_submissions_{column}_trgm
+                        ON school_submissions USING gin ({column} gin_trgm_ops);
+                """))
+
+            # 12. Append-only admin audit log (replaces admin_activity_log.csv)
+            print("Creating table 'admin_audit_log'...")
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS admin_audit_log (
+                    id BIGSERIAL PRIMARY KEY,
+                    logged_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    admin VARCHAR(255) NOT NULL,
+                    action VARCHAR(50) NOT NULL,
+                    submission_id INTEGER,
+                    school_name VARCHAR(255),
+                    lga_name VARCHAR(100),
+                    details TEXT
+                );
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_audit_logged_at
+                    ON admin_audit_log (logged_at DESC, id DESC);
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_audit_admin_logged_at
+                    ON admin_audit_log (admin, logged_at DESC, id DESC);
+            """))
+            conn.execute(text("""
+                CREATE OR REPLACE FUNCTION admin_audit_log_append_only() RETURNS trigger AS $$
+                BEGIN
+                    RAISE EXCEPTION 'admin_audit_log is append-only';
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+            conn.execute(text("DROP TRIGGER IF EXISTS trg_admin_audit_log_append_only ON admin_audit_log;"))
+            conn.execute(text("""
+                CREATE TRIGGER trg_admin_audit_log_append_only
+                    BEFORE UPDATE OR DELETE ON admin_audit_log
+                    FOR EACH ROW EXECUTE FUNCTION admin_audit_log_append_only();
+            """))
+            import_legacy_admin_log(conn)
+
+            # 13. Published-data version counter (polled by the Live Dashboard)
+            print("Creating table 'dwh.data_version'...")
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS dwh.data_version (
+                    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    version BIGINT NOT NULL DEFAULT 0,
+                    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                );
+            """))
+            conn.execute(text("INSERT INTO dwh.data_version (id) VALUES (1) ON CONFLICT (id) DO NOTHING;"))
+
+            # 14. Transparency Ranking snapshots (portal/ranking.py), kept as trend history
+            print("Creating table 'dwh.lga_ranking_snapshot'...")
+            snapshot_counts = "".join(
+                f"{count_column(key)} INTEGER NOT NULL DEFAULT 0, " for key in FACILITY_KEYS
+            )
+            conn.execute(text("CREATE SEQUENCE IF NOT EXISTS dwh.lga_ranking_snapshot_seq;"))
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS dwh.lga_ranking_snapshot (
+                    snapshot_id BIGINT NOT NULL,
+                    taken_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    lga_key INTEGER NOT NULL REFERENCES dwh.dim_lga(lga_key),
+                    lga_name VARCHAR(100) NOT NULL,
+                    rank INTEGER NOT NULL,
+                    verified_schools INTEGER NOT NULL DEFAULT 0,
+                    total_submissions INTEGER NOT NULL DEFAULT 0,
+                    enrollment_total BIGINT NOT NULL DEFAULT 0,
+                    teachers_total BIGINT NOT NULL DEFAULT 0,
+                    {snapshot_counts}
+                    PRIMARY KEY (snapshot_id, lga_key)
+                );
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_ranking_snapshot_taken
+                    ON dwh.lga_ranking_snapshot (taken_at);
+            """))
+
+            # 15. One row per school (LGA + normalized name) pointing at its current record;
+            #     submissions are the history (portal/schools.py)
+            print("Creating table 'schools'...")
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schools (
+                    id SERIAL PRIMARY KEY,
+                    lga_key INTEGER NOT NULL REFERENCES dwh.dim_lga(lga_key),
+                    name_key VARCHAR(255) NOT NULL,
+                    school_name VARCHAR(255) NOT NULL,
+                    current_submission_id INTEGER REFERENCES school_submissions(id),
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    UNIQUE (lga_key, name_key)
+                );
+            """))
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_schools_current
+                    ON schools (current_submission_id)
+                    WHERE current_submission_id IS NOT NULL;
+            """))
+            conn.execute(text("""
+                ALTER TABLE school_submissions
+                    ADD COLUMN IF NOT EXISTS school_id INTEGER REFERENCES schools(id);
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_school
+                    ON school_submissions (school_id, submitted_at DESC, id DESC);
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_submissions_school_approved
+                    ON school_submissions (school_id, submitted_at DESC, id DESC)
+                    WHERE approved = TRUE;
+            """))
+            print("Linking submissions to schools...")
+            link_submissions(conn)
+
+            # 16. Recompute pointers and aggregates so upgraded databases start out consistent
+            print("Rebuilding LGA aggregates...")
+            rebuild_lga_aggregates(conn)
             
             print("✅ Database setup complete! All tables created and LGAs populated.")
 
     except Exception as e:
         print(f"❌ Error during setup: {e}")
 
+def rebuild_aggregates():
+    if not get_database_url():
+        return
+
+    print("🔁 Rebuilding dwh.fact_abia_metrics from approved submissions...")
+    try:
+        with db.get_engine().begin() as conn:
+            rebuild_lga_aggregates(conn)
+        print("✅ LGA aggregates rebuilt.")
+    except Exception as e:
+        print(f"❌ Error during rebuild: {e}")
+
 if __name__ == "__main__":
-    setup_database()
+    parser = argparse.ArgumentParser(description="Create or upgrade the Abia Education Portal database.")
+    parser.add_argument("--rebuild-aggregates", action="store_true",
+                        help="only recompute dwh.fact_abia_metrics (repair after manual edits)")
+    args = parser.parse_args()
+
+    if args.rebuild_aggregates:
+        rebuild_aggregates()
+    else:
+        setup_database()
+
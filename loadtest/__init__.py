@@ -0,0 +1,9 @@
+"""Headless multi-user load test for the Streamlit app.
+
+    python -m loadtest.run --viewers 50 --submitters 5 --admins 2 --duration 120
+
+Virtual users drive the real ``app.py`` through Streamlit's ``AppTest`` inside one
+process, which is exactly the situation of one Streamlit worker: every session
+shares the pooled engine, the data caches and the GIL. Point it at a benchmark
+database (see benchmarks/) — submitters insert rows and admins approve them.
+"""
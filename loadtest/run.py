@@ -0,0 +1,181 @@
+"""Run the load test and report per-page latency, pool usage and memory.
+
+    python -m loadtest.run --viewers 50 --submitters 5 --admins 2 --duration 120 --output load.json
+
+Users are started over ``--ramp-up`` seconds. While they run, the connection pool
+(``portal.db.pool_stats``) and the process RSS are sampled once per second; the
+report gives p50/p95/p99 per page, error counts, peak connections in use, pool
+checkout waits/timeouts and peak memory.
+
+With ``--check`` the run doubles as a smoke test: it exits with status 1 if any
+request failed, e.g. the Request Data export not producing a download button:
+
+    python -m loadtest.run --viewers 0 --submitters 0 --admins 0 --requesters 1 --duration 5 --check
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import text
+
+from loadtest.users import Admin, Recorder, Requester, Submitter, Viewer, sample_photo
+from portal import db
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc, falling back to the peak)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Sampler(threading.Thread):
+    """Samples pool occupancy and RSS every ``interval`` seconds."""
+
+    def __init__(self, stop, interval=1.0):
+        super().__init__(daemon=True)
+        self.stop = stop
+        self.interval = interval
+        self.checked_out = []
+        self.rss = []
+
+    def run(self):
+        while not self.stop.is_set():
+            self.checked_out.append(db.pool_stats().get("checked_out", 0))
+            self.rss.append(rss_mb())
+            self.stop.wait(self.interval)
+
+
+def summarize(recorder, sampler, elapsed, pool_before, pool_after):
+    by_page = defaultdict(list)
+    errors = defaultdict(list)
+    for page, seconds, ok, error in recorder.samples:
+        if ok:
+            by_page[page].append(seconds * 1000)
+        else:
+            errors[page].append(error)
+    pages = {}
+    for page in sorted(set(by_page) | set(errors)):
+        times = by_page.get(page, [])
+        pages[page] = {
+            "requests": len(times),
+            "errors": len(errors.get(page, [])),
+            "per_second": round(len(times) / elapsed, 2),
+            "p50_ms": round(_percentile(times, 50), 1) if times else None,
+            "p95_ms": round(_percentile(times, 95), 1) if times else None,
+            "p99_ms": round(_percentile(times, 99), 1) if times else None,
+            "max_ms": round(max(times), 1) if times else None,
+            "first_error": errors[page][0] if errors.get(page) else None,
+        }
+    checkouts = pool_after["checkouts"] - pool_before["checkouts"]
+    return {
+        "duration_s": round(elapsed, 1),
+        "pages": pages,
+        "pool": {
+            "size": pool_after.get("pool_size"),
+            "peak_checked_out": max(sampler.checked_out, default=0),
+            "mean_checked_out": round(statistics.mean(sampler.checked_out), 2) if sampler.checked_out else 0,
+            "checkouts": checkouts,
+            "timeouts": pool_after["timeouts"] - pool_before["timeouts"],
+            "wait_ms_avg": round((pool_after["wait_ms_total"] - pool_before["wait_ms_total"]) / max(checkouts, 1), 2),
+        },
+        "memory_mb": {
+            "start": round(sampler.rss[0], 1) if sampler.rss else None,
+            "peak": round(max(sampler.rss), 1) if sampler.rss else None,
+            "end": round(sampler.rss[-1], 1) if sampler.rss else None,
+        },
+    }
+
+
+def print_report(report, args):
+    print(f"\n{args.viewers} viewers • {args.submitters} submitters • {args.admins} admins"
+          f" • {args.requesters} requesters • {report['duration_s']}s")
+    print(f"\n{'page':<28}{'req':>7}{'err':>6}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for page, s in report["pages"].items():
+        fmt = lambda v: f"{v:>8.0f}ms" if v is not None else f"{'-':>10}"
+        print(f"{page:<28}{s['requests']:>7}{s['errors']:>6}{s['per_second']:>8.2f}"
+              f"{fmt(s['p50_ms'])}{fmt(s['p95_ms'])}{fmt(s['p99_ms'])}")
+    pool, mem = report["pool"], report["memory_mb"]
+    print(f"\nDB pool: size {pool['size']} • peak in use {pool['peak_checked_out']} • mean {pool['mean_checked_out']}"
+          f" • avg checkout wait {pool['wait_ms_avg']} ms • timeouts {pool['timeouts']}")
+    print(f"Worker memory: {mem['start']} MB at start • peak {mem['peak']} MB • {mem['end']} MB at end")
+    for page, s in report["pages"].items():
+        if s["first_error"]:
+            print(f"First error on {page}: {s['first_error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent portal users in one worker process.")
+    parser.add_argument("--viewers", type=int, default=20, help="public viewers (mostly the Live Dashboard)")
+    parser.add_argument("--submitters", type=int, default=2, help="schools submitting data")
+    parser.add_argument("--admins", type=int, default=1, help="admins approving submissions")
+    parser.add_argument("--requesters", type=int, default=1, help="visitors exporting from Request Data")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds over which users start")
+    parser.add_argument("--think", type=float, default=5, help="mean seconds between a user's actions")
+    parser.add_argument("--poll", type=float, default=10, help="dashboard data-version poll interval")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any request failed")
+    args = parser.parse_args(argv)
+
+    # Submitted emails go to the outbox only; the load test must never send mail
+    os.environ["EMAIL_SENDER_IN_APP"] = "false"
+    engine = db.get_engine()
+    if engine is None:
+        sys.exit("Missing database credentials (DB_USER, DB_PASSWORD, DB_HOST, DB_NAME).")
+    with engine.connect() as conn:
+        lgas = [r[0] for r in conn.execute(text("SELECT lga_name FROM dwh.dim_lga ORDER BY lga_name"))]
+    photo = sample_photo() if args.submitters else (None, None)
+
+    recorder, stop = Recorder(), threading.Event()
+    users = [Viewer(recorder, stop, args.think, args.seed + i, poll=args.poll) for i in range(args.viewers)]
+    users += [Submitter(recorder, stop, args.think, args.seed + 10_000 + i, photo=photo, lgas=lgas)
+              for i in range(args.submitters)]
+    users += [Admin(recorder, stop, args.think, args.seed + 20_000 + i) for i in range(args.admins)]
+    users += [Requester(recorder, stop, args.think, args.seed + 30_000 + i) for i in range(args.requesters)]
+
+    sampler = Sampler(stop)
+    pool_before = db.pool_stats()
+    sampler.start()
+    start = time.perf_counter()
+    for user in users:
+        user.start()
+        time.sleep(args.ramp_up / max(len(users), 1))
+    stop.wait(args.duration)
+    stop.set()
+    for user in users:
+        user.join(timeout=120)
+    elapsed = time.perf_counter() - start
+
+    report = summarize(recorder, sampler, elapsed, pool_before, db.pool_stats())
+    report["config"] = vars(args)
+    print_report(report, args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.output}")
+    if args.check and any(s["errors"] for s in report["pages"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Virtual users for the load test.
+
+Each user owns one ``AppTest`` session (its own ``st.session_state``) and loops
+until the stop event is set, recording the wall time of every script run under a
+page name:
+
+    Viewer     opens a public page (?page= deep link), then polls the data version
+               like the dashboard's fragment does and reruns only when it changed
+    Submitter  a logged-in school completing the verification step of Submit Data
+               (photo upload and code email are pre-staged; the INSERT, aggregate
+               update and outbox write are real)
+    Admin      opens the Admin Panel and approves the newest pending submission
+    Requester  opens Request Data and generates a CSV export; the run fails unless
+               the download button renders with no error on the page
+"""
+import io
+import os
+import random
+import threading
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from portal import db
+from portal.dashboard import data_version
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+RUN_TIMEOUT = 60
+
+VIEWER_PAGES = ("Live Dashboard", "Home", "Transparency Ranking", "School Lookup")
+VIEWER_WEIGHTS = (6, 2, 1, 1)
+
+
+class Recorder:
+    """Thread-safe collection of ``(page, seconds, ok)`` samples."""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, page, seconds, ok=True, error=None):
+        with self._lock:
+            self.samples.append((page, seconds, ok, error))
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, recorder, stop, think, seed):
+        super().__init__(daemon=True)
+        self.recorder = recorder
+        self.stop = stop
+        self.think = think
+        self.rng = random.Random(seed)
+        self.at = None
+
+    def open(self, page, **session):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        self.at.query_params["page"] = page
+        for key, value in session.items():
+            self.at.session_state[key] = value
+        return self.timed(page, self.at.run)
+
+    def timed(self, label, action, check=None):
+        """Run ``action`` and record it; ``check(at)`` may return an extra error message."""
+        start = time.perf_counter()
+        try:
+            action()
+            errors = [e.value for e in self.at.exception] if self.at is not None else []
+            if not errors and check is not None:
+                problem = check(self.at)
+                errors = [problem] if problem else []
+            ok = not errors
+            self.recorder.add(label, time.perf_counter() - start, ok, errors[0] if errors else None)
+            return ok
+        except Exception as e:
+            self.recorder.add(label, time.perf_counter() - start, False, repr(e))
+            return False
+
+    def pause(self):
+        # Think time with +/-50% jitter so users do not move in lock step
+        self.stop.wait(self.think * self.rng.uniform(0.5, 1.5))
+
+    def run(self):
+        while not self.stop.is_set():
+            self.step()
+            self.pause()
+
+    def step(self):
+        raise NotImplementedError
+
+
+class Viewer(VirtualUser):
+    def __init__(self, *args, poll=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.poll = poll
+        self.version = None
+        self.current = None
+
+    def step(self):
+        engine = db.get_engine()
+        if self.current is None or self.rng.random() < 0.2:
+            self.current = self.rng.choices(VIEWER_PAGES, VIEWER_WEIGHTS)[0]
+            self.version = data_version(engine)
+            self.open(self.current)
+            return
+        if self.current != "Live Dashboard":
+            self.timed(self.current, self.at.run)
+            return
+        # Dashboard fragment: cheap version check, full rerun only after a change
+        start = time.perf_counter()
+        version = data_version(engine)
+        self.recorder.add("Live Dashboard (poll)", time.perf_counter() - start)
+        if version != self.version:
+            self.version = version
+            self.timed("Live Dashboard", self.at.run)
+
+    def pause(self):
+        self.stop.wait(self.poll if self.current == "Live Dashboard" else self.think * self.rng.uniform(0.5, 1.5))
+
+
+def sample_photo():
+    """Store one small generated JPEG through the real pipeline; returns its refs."""
+    from PIL import Image
+
+    from portal.images import ingest_photo
+
+    buf = io.BytesIO()
+    Image.new("RGB", (1200, 900), (34, 139, 34)).save(buf, "JPEG")
+    return ingest_photo(buf.getvalue())
+
+
+class Submitter(VirtualUser):
+    def __init__(self, *args, photo, lgas, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.photo_path, self.thumb_path = photo
+        self.lgas = lgas
+        self.count = 0
+
+    def step(self):
+        self.count += 1
+        code = 123456
+        temp = {
+            "school": f"Load Test School {self.ident}-{self.count}",
+            "lga": self.rng.choice(self.lgas),
+            "students": self.rng.randint(80, 1500),
+            "teachers": self.rng.randint(4, 60),
+            "name": "Load Tester",
+            "email": f"loadtest+{self.ident}-{self.count}@example.org",
+            "facilities": [],
+            "photo_path": self.photo_path,
+            "thumb_path": self.thumb_path,
+        }
+        user = {"full_name": "Load Tester", "user_type": "school", "email_verified": True}
+        if not self.open("Submit Data", user=user, awaiting_code=True, temp_data=temp, verification_code=code):
+            return
+        code_box = next((t for t in self.at.text_input if t.label == "Enter 6-digit code"), None)
+        submit = next((b for b in self.at.button if b.label == "Verify & Submit"), None)
+        if code_box is None or submit is None:
+            self.recorder.add("Submit Data (save)", 0.0, False, "verification form not rendered")
+            return
+        code_box.input(str(code))
+        self.timed("Submit Data (save)", submit.click().run)
+
+
+class Admin(VirtualUser):
+    def step(self):
+        if not self.open("Admin Panel", admin=True, admin_user="loadtest-admin"):
+            return
+        approve = [b for b in self.at.button if (b.key or "").startswith("approve_")]
+        if approve:
+            self.timed("Admin Panel (approve)", approve[0].click().run)
+
+
+def export_error(at):
+    """Why the Request Data export did not produce a download button, or None."""
+    failed = [e.value for e in at.error if "export" in e.value.lower()]
+    if failed:
+        return failed[0]
+    if not at.get("download_button"):
+        return "download button not rendered"
+    return None
+
+
+class Requester(VirtualUser):
+    def step(self):
+        if not self.open("Request Data"):
+            return
+        fmt = next((r for r in self.at.radio if r.label == "Export format"), None)
+        generate = next((b for b in self.at.button if b.label == "Generate & Download"), None)
+        if fmt is None or generate is None:
+            self.recorder.add("Request Data (export)", 0.0, False, "export controls not rendered")
+            return
+        fmt.set_value("CSV (.csv)")
+        self.timed("Request Data (export)", generate.click().run, check=export_error)
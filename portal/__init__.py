@@ -0,0 +1 @@
+"""Shared building blocks for the Abia Education Portal (database, caching, services)."""
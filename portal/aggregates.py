@@ -0,0 +1,177 @@
+"""Per-LGA aggregate table ``dwh.fact_abia_metrics``, maintained incrementally.
+
+The table sums each school's *current* record only (``schools.current_submission_id``,
+see portal/schools.py), so resubmissions replace a school's numbers instead of
+adding to them. Every approval-status change goes through ``set_submission_status``,
+which updates ``school_submissions``, moves the affected schools' current pointers
+and applies the difference (old current record out, new one in) in the same
+transaction, then takes a ranking snapshot (portal/ranking.py) and bumps
+``dwh.data_version`` (portal/dataversion.py) when anything changed.
+``submission_count`` counts the schools that have submitted at all, regardless of
+status, and is maintained by ``add_submission_counts`` when a save creates a school.
+Pending schools are not published, so that alone takes no snapshot and bumps no
+version; the ranking picks the count up with its next snapshot.
+The dashboard then reads 17 ready-made
+rows. ``rebuild_lga_aggregates`` recomputes the pointers and the table from scratch
+for repairs (``python database_setup.py --rebuild-aggregates``).
+"""
+from sqlalchemy import text
+
+from portal.dataversion import bump_data_version
+from portal.facilities import FACILITY_KEYS, count_column, has_facility_sql
+from portal.querylog import execute
+from portal.ranking import refresh_ranking_snapshot
+from portal.schools import LATEST_APPROVED_SQL, repoint_all_schools
+
+METRIC_COLUMNS = ["enrollment_total", "teachers_total", "school_count"] + [
+    count_column(key) for key in FACILITY_KEYS
+]
+
+
+def _metric_exprs(weight, alias="s"):
+    """SUM expressions for every metric column, each row weighted by ``weight``."""
+    exprs = [
+        f"SUM({weight} * COALESCE({alias}.enrollment_total, 0))",
+        f"SUM({weight} * COALESCE({alias}.teachers_total, 0))",
+        f"SUM({weight})",
+    ]
+    exprs += [f"SUM({weight} * ({has_facility_sql(key, alias)})::int)" for key in FACILITY_KEYS]
+    return exprs
+
+
+def _select_list(weight, alias="s"):
+    return ",\n               ".join(
+        f"COALESCE({expr}, 0) AS {col}" for expr, col in zip(_metric_exprs(weight, alias), METRIC_COLUMNS)
+    )
+
+
+_COLUMN_LIST = ", ".join(METRIC_COLUMNS)
+_ACCUMULATE = ",\n        ".join(f"{col} = f.{col} + EXCLUDED.{col}" for col in METRIC_COLUMNS)
+_OVERWRITE = ",\n        ".join(f"{col} = EXCLUDED.{col}" for col in METRIC_COLUMNS)
+
+# Ids travel as one array parameter: an expanding IN list binds one parameter per id,
+# and a bulk import approving more than 65,535 rows would overflow the protocol's limit
+_STATUS_SQL = text("""
+    UPDATE school_submissions s
+    SET approved = CAST(:approved AS BOOLEAN)
+    WHERE s.id = ANY(CAST(:ids AS INTEGER[])) AND s.approved IS DISTINCT FROM CAST(:approved AS BOOLEAN)
+    RETURNING s.id, s.school_name, s.lga_name, s.email, s.school_id
+""")
+
+# Taken as a separate statement so the repoint below, which starts a new snapshot,
+# sees approvals committed by a concurrent transaction that held these rows
+_LOCK_SCHOOLS_SQL = text("""
+    SELECT id FROM schools WHERE id = ANY(CAST(:school_ids AS INTEGER[])) ORDER BY id FOR UPDATE
+""")
+
+_REPOINT_SQL = text(f"""
+    WITH latest AS (
+        SELECT sc.id AS school_id, sc.current_submission_id AS old_id,
+               ({LATEST_APPROVED_SQL.format(school="sc.id")}) AS new_id
+        FROM schools sc
+        WHERE sc.id = ANY(CAST(:school_ids AS INTEGER[]))
+    ),
+    moved AS (
+        UPDATE schools sc
+        SET current_submission_id = m.new_id, updated_at = NOW()
+        FROM latest m
+        WHERE sc.id = m.school_id AND m.old_id IS DISTINCT FROM m.new_id
+        RETURNING m.old_id, m.new_id
+    ),
+    weighted AS (
+        SELECT old_id AS id, -1 AS weight FROM moved WHERE old_id IS NOT NULL
+        UNION ALL
+        SELECT new_id AS id, 1 AS weight FROM moved WHERE new_id IS NOT NULL
+    ),
+    delta AS (
+        SELECT s.lga_key,
+               {_select_list("w.weight")}
+        FROM weighted w
+        JOIN school_submissions s ON s.id = w.id
+        GROUP BY s.lga_key
+    ),
+    applied AS (
+        INSERT INTO dwh.fact_abia_metrics AS f (lga_key, {_COLUMN_LIST}, updated_at)
+        SELECT lga_key, {_COLUMN_LIST}, NOW() FROM delta
+        ON CONFLICT (lga_key) DO UPDATE SET
+        {_ACCUMULATE},
+        updated_at = NOW()
+    )
+    SELECT COUNT(*) FROM moved
+""")
+
+_REBUILD_SQL = text(f"""
+    INSERT INTO dwh.fact_abia_metrics AS f (lga_key, {_COLUMN_LIST}, updated_at)
+    SELECT l.lga_key,
+           {_select_list("(s.id IS NOT NULL)::int")},
+           NOW()
+    FROM dwh.dim_lga l
+    LEFT JOIN schools sc ON sc.lga_key = l.lga_key AND sc.current_submission_id IS NOT NULL
+    LEFT JOIN school_submissions s ON s.id = sc.current_submission_id
+    GROUP BY l.lga_key
+    ON CONFLICT (lga_key) DO UPDATE SET
+    {_OVERWRITE},
+    updated_at = NOW()
+""")
+
+
+_SUBMISSION_COUNT_SQL = text("""
+    INSERT INTO dwh.fact_abia_metrics AS f (lga_key, submission_count, updated_at)
+    VALUES (:lga_key, :n, NOW())
+    ON CONFLICT (lga_key) DO UPDATE SET
+    submission_count = f.submission_count + EXCLUDED.submission_count,
+    updated_at = NOW()
+""")
+
+_REBUILD_SUBMISSION_COUNT_SQL = text("""
+    UPDATE dwh.fact_abia_metrics f
+    SET submission_count = c.n
+    FROM (
+        SELECT l.lga_key, COUNT(sc.id) AS n
+        FROM dwh.dim_lga l
+        LEFT JOIN schools sc ON sc.lga_key = l.lga_key
+        GROUP BY l.lga_key
+    ) c
+    WHERE c.lga_key = f.lga_key
+""")
+
+
+def add_submission_counts(conn, counts):
+    """Add newly created schools to ``submission_count``; ``counts`` maps lga_key -> number."""
+    rows = [{"lga_key": int(k), "n": int(n)} for k, n in counts.items() if k is not None and n]
+    if rows:
+        execute("aggregates.submission_count", conn, _SUBMISSION_COUNT_SQL, rows)
+
+
+def set_submission_status(conn, submission_ids, approved):
+    """Approve (True), reject (False) or reopen (None) submissions inside ``conn``'s
+    transaction, keeping the schools' current records and the LGA aggregates in step.
+
+    Rows already in the requested state are left alone, so repeated clicks or two
+    admins acting on the same submission never double count. Returns the changed
+    submissions as dicts (id, school_name, lga_name, email).
+    """
+    ids = [int(i) for i in submission_ids]
+    if not ids:
+        return []
+    result = execute("aggregates.set_status", conn, _STATUS_SQL, {"ids": ids, "approved": approved})
+    changed = [dict(row._mapping) for row in result]
+    school_ids = sorted({sub.pop("school_id") for sub in changed} - {None})
+    if school_ids:
+        execute("aggregates.lock_schools", conn, _LOCK_SCHOOLS_SQL, {"school_ids": school_ids})
+        execute("aggregates.repoint", conn, _REPOINT_SQL, {"school_ids": school_ids})
+    if changed:
+        refresh_ranking_snapshot(conn)
+        bump_data_version(conn)
+    return changed
+
+
+def rebuild_lga_aggregates(conn):
+    """Recompute every LGA row from the submissions (full scan, for repairs)."""
+    # Block concurrent incremental updates while the table is recomputed
+    conn.execute(text("LOCK TABLE dwh.fact_abia_metrics IN SHARE ROW EXCLUSIVE MODE"))
+    repoint_all_schools(conn)
+    execute("aggregates.rebuild", conn, _REBUILD_SQL)
+    execute("aggregates.rebuild_submission_count", conn, _REBUILD_SUBMISSION_COUNT_SQL)
+    refresh_ranking_snapshot(conn)
+    bump_data_version(conn)
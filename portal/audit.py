@@ -0,0 +1,113 @@
+"""Append-only admin audit trail in ``admin_audit_log``.
+
+Entries are written in the same transaction as the action they describe (one
+batched INSERT per action), so the log can never disagree with the data, and a
+trigger rejects UPDATE/DELETE. Reads are keyset-paginated on ``(logged_at, id)``
+with optional time-range and admin filters; the full download is streamed. The
+admin filter's choices come from ``list_admins``, a loose index scan cached for
+``AUDIT_ADMINS_TTL`` seconds and cleared whenever an entry is written.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from portal.config import get_setting
+from portal.querylog import cached_query, execute, read_sql
+
+LOG_PAGE_SIZE = 50
+
+AUDIT_ADMINS_TTL = get_setting("AUDIT_ADMINS_TTL", 60, cast=int)
+
+LOG_COLUMNS = "id, logged_at, admin, action, submission_id, school_name, lga_name, details"
+
+# Distinct admins by hopping through idx_audit_admin_logged_at (one index probe per
+# admin) instead of scanning the ever-growing log
+_ADMINS_SQL = text("""
+    WITH RECURSIVE admins AS (
+        SELECT MIN(admin) AS admin FROM admin_audit_log
+        UNION ALL
+        SELECT (SELECT MIN(l.admin) FROM admin_audit_log l WHERE l.admin > a.admin)
+        FROM admins a
+        WHERE a.admin IS NOT NULL
+    )
+    SELECT admin FROM admins WHERE admin IS NOT NULL
+""")
+
+_INSERT_SQL = text("""
+    INSERT INTO admin_audit_log (admin, action, submission_id, school_name, lga_name, details)
+    VALUES (:admin, :action, :submission_id, :school_name, :lga_name, :details)
+""")
+
+
+@dataclass
+class AuditFilter:
+    start_date: date = None
+    end_date: date = None
+    admin: str = None
+
+
+def log_actions(conn, admin, action, submissions, details=None):
+    """Record ``action`` for every submission dict (id, school_name, lga_name) in one batch."""
+    rows = [{
+        "admin": admin,
+        "action": action,
+        "submission_id": sub.get("id"),
+        "school_name": sub.get("school_name"),
+        "lga_name": sub.get("lga_name"),
+        "details": details,
+    } for sub in submissions]
+    if rows:
+        execute("audit.insert", conn, _INSERT_SQL, rows)
+        list_admins.clear()
+    return len(rows)
+
+
+def _where(flt):
+    clauses, params = [], {}
+    if flt.start_date:
+        clauses.append("logged_at >= :start")
+        params["start"] = flt.start_date
+    if flt.end_date:
+        clauses.append("logged_at < :end")
+        params["end"] = flt.end_date + timedelta(days=1)
+    if flt.admin:
+        clauses.append("admin = :admin")
+        params["admin"] = flt.admin
+    return clauses, params
+
+
+def fetch_log_page(engine, flt, cursor=None, limit=LOG_PAGE_SIZE):
+    """Newest-first page after ``cursor`` = ``(logged_at, id)``. Returns ``(df, next_cursor)``."""
+    clauses, params = _where(flt)
+    if cursor is not None:
+        clauses.append("(logged_at, id) < (:cursor_ts, :cursor_id)")
+        params["cursor_ts"], params["cursor_id"] = cursor
+    params["limit"] = limit + 1
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    df = read_sql("audit.page", text(f"""
+        SELECT {LOG_COLUMNS}
+        FROM admin_audit_log
+        {where}
+        ORDER BY logged_at DESC, id DESC
+        LIMIT :limit
+    """), engine, params=params)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        next_cursor = (df.iloc[-1]["logged_at"].to_pydatetime(), int(df.iloc[-1]["id"]))
+    return df, next_cursor
+
+
+def log_export_statement(flt):
+    """``(statement, params)`` for streaming the filtered log (see portal/export.py)."""
+    clauses, params = _where(flt)
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    return text(f"SELECT {LOG_COLUMNS} FROM admin_audit_log {where} ORDER BY logged_at DESC, id DESC"), params
+
+
+@cached_query("audit.admins", ttl=AUDIT_ADMINS_TTL, show_spinner=False)
+def list_admins(_engine):
+    """Admins that appear in the log, alphabetically."""
+    with _engine.connect() as conn:
+        return [r[0] for r in execute("audit.admins", conn, _ADMINS_SQL)]
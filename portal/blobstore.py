@@ -0,0 +1,155 @@
+"""Content-addressed photo storage.
+
+Blobs are keyed by the SHA-256 of their bytes, so resubmitting the same image stores
+it once and concurrent uploads can never overwrite each other. References saved in
+``school_submissions.photo_path`` / ``thumb_path`` look like ``sha256:<hex>.<ext>``;
+older rows still hold plain ``uploads/...`` file paths and are resolved as such.
+
+Backends (``BLOB_BACKEND`` setting, env / secrets, optional ``[STORAGE]`` section):
+
+    local   files under BLOB_LOCAL_ROOT (default uploads/blobs), fanned out by hash prefix
+    s3      any S3-compatible service (AWS, MinIO, ...): S3_BUCKET, S3_ENDPOINT_URL,
+            S3_REGION, S3_ACCESS_KEY_ID, S3_SECRET_ACCESS_KEY, S3_PREFIX; needs boto3
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+from portal.config import get_setting
+
+REF_PREFIX = "sha256:"
+
+CONTENT_TYPES = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+def _setting(name, default=None):
+    return get_setting(name, default, section="STORAGE")
+
+
+def make_key(data, ext):
+    return f"{hashlib.sha256(data).hexdigest()}.{ext.lower().lstrip('.')}"
+
+
+def is_blob_ref(ref):
+    return isinstance(ref, str) and ref.startswith(REF_PREFIX)
+
+
+class LocalBlobStore:
+    """Blobs as files: ``<root>/ab/cd/abcd....ext``."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def put(self, data, ext):
+        key = make_key(data, ext)
+        path = self._path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return key
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class S3BlobStore:
+    """Blobs as objects in an S3-compatible bucket (AWS S3, MinIO, ...)."""
+
+    def __init__(self, bucket, endpoint_url=None, region=None, access_key=None, secret_key=None, prefix=""):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError("BLOB_BACKEND=s3 requires boto3 (pip install boto3)")
+        self._client_error = ClientError
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix else ""
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+        )
+
+    def _object_key(self, key):
+        return f"{self.prefix}{key[:2]}/{key}"
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except self._client_error:
+            return False
+
+    def put(self, data, ext):
+        key = make_key(data, ext)
+        if not self.exists(key):
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=self._object_key(key),
+                Body=data,
+                ContentType=CONTENT_TYPES.get(ext.lower(), "application/octet-stream"),
+            )
+        return key
+
+    def get(self, key):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"].read()
+        except self._client_error:
+            return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    """The configured store, created once per process."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if _setting("BLOB_BACKEND", "local").lower() == "s3":
+                _store = S3BlobStore(
+                    bucket=_setting("S3_BUCKET"),
+                    endpoint_url=_setting("S3_ENDPOINT_URL"),
+                    region=_setting("S3_REGION"),
+                    access_key=_setting("S3_ACCESS_KEY_ID"),
+                    secret_key=_setting("S3_SECRET_ACCESS_KEY"),
+                    prefix=_setting("S3_PREFIX", ""),
+                )
+            else:
+                _store = LocalBlobStore(_setting("BLOB_LOCAL_ROOT", os.path.join("uploads", "blobs")))
+    return _store
+
+
+def put_blob(data, ext):
+    """Store ``data`` and return its reference for the database."""
+    return REF_PREFIX + get_blob_store().put(data, ext)
+
+
+def read_blob(ref):
+    """Bytes behind a stored reference (blob ref or legacy file path), or None."""
+    if not ref:
+        return None
+    if is_blob_ref(ref):
+        return get_blob_store().get(ref[len(REF_PREFIX):])
+    if os.path.exists(ref):
+        with open(ref, "rb") as f:
+            return f.read()
+    return None
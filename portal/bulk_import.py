@@ -0,0 +1,346 @@
+"""Admin bulk import of census spreadsheets (CSV or XLSX) into ``school_submissions``.
+
+The file is streamed row by row (``csv`` / openpyxl read-only mode), so memory does
+not grow with its size. Each row is validated in Python against ``dwh.dim_lga`` and
+the facility vocabulary (portal/facilities.py); invalid rows go to the error report
+with their line number, valid rows are buffered and sent to a temporary staging
+table with ``COPY ... FROM STDIN`` in batches. One ``INSERT ... SELECT`` then merges
+the staging table into ``school_submissions``, creating or reusing each row's school
+(portal/schools.py), and the per-LGA school counts are updated in the same
+transaction. With ``approve=True`` the imported rows go through
+``set_submission_status`` like a bulk approval, which updates the aggregates, the
+ranking snapshot and the data version once for the whole file.
+
+Columns are matched by header, case-insensitively (see ``HEADER_ALIASES``).
+Facilities are either one ``facilities`` column listing labels, short labels or
+keys separated by ``;`` or ``,``, or one yes/no column per facility key.
+"""
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+from sqlalchemy import text
+
+from portal.aggregates import add_submission_counts, set_submission_status
+from portal.audit import log_actions
+from portal.facilities import FACILITIES, FACILITY_BITS, FACILITY_KEYS, SHORT_LABELS
+from portal.querylog import execute
+from portal.schools import name_key_sql
+
+BATCH_ROWS = 10_000
+MAX_REPORTED_ERRORS = 10_000
+
+HEADER_ALIASES = {
+    "school_name": ("school_name", "school", "name_of_school"),
+    "lga_name": ("lga_name", "lga", "local_government_area"),
+    "enrollment_total": ("enrollment_total", "students", "enrollment", "total_students"),
+    "teachers_total": ("teachers_total", "teachers", "total_teachers"),
+    "submitted_by": ("submitted_by", "contact_name", "principal", "head_teacher"),
+    "email": ("email", "school_email"),
+    "facilities": ("facilities", "functional_facilities"),
+}
+REQUIRED_COLUMNS = ("school_name", "lga_name", "enrollment_total", "teachers_total")
+TRUE_VALUES = {"1", "y", "yes", "true", "x", "working", "functional"}
+FALSE_VALUES = {"", "0", "n", "no", "false", "none", "not working"}
+
+STAGING_COLUMNS = ("line", "school_name", "lga_name", "lga_key", "enrollment_total", "teachers_total",
+                   "submitted_by", "email", "facilities", "facilities_mask")
+
+_CREATE_STAGING_SQL = text("""
+    CREATE TEMP TABLE submission_import (
+        line INTEGER NOT NULL,
+        school_name VARCHAR(255) NOT NULL,
+        lga_name VARCHAR(100) NOT NULL,
+        lga_key INTEGER NOT NULL,
+        enrollment_total INTEGER NOT NULL,
+        teachers_total INTEGER NOT NULL,
+        submitted_by VARCHAR(100),
+        email VARCHAR(100),
+        facilities JSONB,
+        facilities_mask SMALLINT NOT NULL
+    ) ON COMMIT DROP
+""")
+
+_COPY_SQL = f"COPY submission_import ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+# Schools are upserted first (one per LGA + normalized name), then every staged row
+# is appended to its school's submission history
+_MERGE_SQL = text(f"""
+    WITH staged AS (
+        SELECT i.*, {name_key_sql("i.school_name")} AS name_key FROM submission_import i
+    ),
+    upserted AS (
+        INSERT INTO schools (lga_key, name_key, school_name)
+        SELECT DISTINCT ON (lga_key, name_key) lga_key, name_key, school_name
+        FROM staged
+        ORDER BY lga_key, name_key, line
+        ON CONFLICT (lga_key, name_key) DO UPDATE SET updated_at = NOW()
+        RETURNING id, lga_key, name_key, (xmax = 0) AS created
+    ),
+    inserted AS (
+        INSERT INTO school_submissions
+        (school_id, school_name, lga_name, lga_key, enrollment_total, teachers_total,
+         submitted_by, email, facilities, facilities_mask, submitted_at, approved)
+        SELECT u.id, i.school_name, i.lga_name, i.lga_key, i.enrollment_total, i.teachers_total,
+               i.submitted_by, i.email, i.facilities, i.facilities_mask, NOW(), NULL
+        FROM staged i
+        JOIN upserted u ON u.lga_key = i.lga_key AND u.name_key = i.name_key
+        ORDER BY i.line
+        RETURNING id, lga_key
+    )
+    SELECT i.lga_key, COUNT(*) AS n, array_agg(i.id) AS ids,
+           (SELECT COUNT(*) FROM upserted u WHERE u.created AND u.lga_key = i.lga_key) AS new_schools
+    FROM inserted i
+    GROUP BY i.lga_key
+""")
+
+# Every spelling a facility may be given in, normalized -> key
+_FACILITY_TOKENS = {}
+for _key, _label in FACILITIES:
+    for _token in (_key, _label, SHORT_LABELS[_key]):
+        _FACILITY_TOKENS[" ".join(_token.lower().replace("_", " ").split())] = _key
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (unreadable, wrong type, missing columns)."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one import; ``errors`` holds ``(line, column, value, message)``."""
+    rows_read: int = 0
+    rows_valid: int = 0
+    rows_imported: int = 0
+    new_schools: int = 0
+    approved: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_rejected(self):
+        return self.rows_read - self.rows_valid
+
+    def error_report(self):
+        return pd.DataFrame(self.errors, columns=["line", "column", "value", "error"])
+
+
+def _normalize_header(value):
+    return "_".join(str(value or "").strip().lower().replace("-", " ").replace("/", " ").split())
+
+
+def _normalize_name(value):
+    return " ".join(str(value).lower().split())
+
+
+def map_headers(headers):
+    """Map file columns to import fields: ``{field: column index}``; facility-key
+    columns are returned as ``("facility", key)`` fields."""
+    positions = {}
+    for index, header in enumerate(headers):
+        name = _normalize_header(header)
+        for target, aliases in HEADER_ALIASES.items():
+            if name in aliases and target not in positions:
+                positions[target] = index
+        if name in FACILITY_BITS and ("facility", name) not in positions:
+            positions[("facility", name)] = index
+    missing = [c for c in REQUIRED_COLUMNS if c not in positions]
+    if missing:
+        raise ImportFileError("Missing required column(s): " + ", ".join(missing))
+    return positions
+
+
+def iter_rows(filename, data):
+    """Yield ``(line, values)`` for every row of a CSV or XLSX file, the header as line 1."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        reader = csv.reader(io.TextIOWrapper(data, encoding="utf-8-sig", newline=""))
+        yield from enumerate(reader, start=1)
+    elif name.endswith(".xlsx"):
+        import openpyxl
+
+        try:
+            workbook = openpyxl.load_workbook(data, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFileError(f"Not a readable Excel workbook: {e}")
+        try:
+            yield from enumerate(workbook.worksheets[0].iter_rows(values_only=True), start=1)
+        finally:
+            workbook.close()
+    else:
+        raise ImportFileError("Upload a .csv or .xlsx file")
+
+
+def _cell(values, index):
+    if index is None or index >= len(values) or values[index] is None:
+        return ""
+    value = values[index]
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _count(raw):
+    try:
+        number = float(raw.replace(",", ""))
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() and 0 < number < 2**31 else None
+
+
+def validate_row(values, positions, lgas):
+    """Return ``(row, errors)``: a staging row dict, or None plus ``(column, value, message)`` errors."""
+    def get(target):
+        return _cell(values, positions.get(target))
+
+    errors = []
+
+    school = " ".join(get("school_name").split())
+    if not school:
+        errors.append(("school_name", "", "School name is required"))
+    elif len(school) > 255:
+        errors.append(("school_name", school[:40] + "…", "School name is longer than 255 characters"))
+
+    lga_raw = get("lga_name")
+    lga = lgas.get(_normalize_name(lga_raw))
+    if lga is None:
+        errors.append(("lga_name", lga_raw, "Unknown LGA" if lga_raw else "LGA is required"))
+
+    counts = {}
+    for column, label in (("enrollment_total", "Students"), ("teachers_total", "Teachers")):
+        raw = get(column)
+        counts[column] = _count(raw)
+        if counts[column] is None:
+            errors.append((column, raw, f"{label} must be a positive whole number"))
+
+    email = get("email").lower()
+    if email and ("@" not in email or len(email) > 100):
+        errors.append(("email", email, "Invalid email address"))
+    contact = get("submitted_by")
+    if len(contact) > 100:
+        errors.append(("submitted_by", contact[:40] + "…", "Contact name is longer than 100 characters"))
+
+    keys = set()
+    listed = get("facilities")
+    for token in listed.replace(";", ",").split(","):
+        token = _normalize_name(token.replace("_", " ")).rstrip(".")
+        if not token:
+            continue
+        key = _FACILITY_TOKENS.get(token)
+        if key is None:
+            errors.append(("facilities", token, "Unknown facility"))
+        else:
+            keys.add(key)
+    for target in positions:
+        if isinstance(target, tuple):
+            flag = get(target).lower()
+            if flag in TRUE_VALUES:
+                keys.add(target[1])
+            elif flag not in FALSE_VALUES:
+                errors.append((target[1], flag, "Expected yes/no"))
+
+    if errors:
+        return None, errors
+    ordered = [key for key in FACILITY_KEYS if key in keys]
+    labels = dict(FACILITIES)
+    return {
+        "school_name": school,
+        "lga_name": lga[1],
+        "lga_key": lga[0],
+        "enrollment_total": counts["enrollment_total"],
+        "teachers_total": counts["teachers_total"],
+        "submitted_by": contact or None,
+        "email": email or None,
+        "facilities": json.dumps([labels[key] for key in ordered]),
+        "facilities_mask": sum(FACILITY_BITS[key] for key in ordered),
+    }, []
+
+
+def import_template():
+    """CSV header row (plus one example row) admins can fill in."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["school_name", "lga", "students", "teachers", "submitted_by", "email", "facilities"])
+    writer.writerow(["Community Secondary School Ohafia", "Ohafia", 640, 28, "Mrs. Chioma Okeke",
+                     "principal.school@abiaschools.edu.ng", "; ".join(SHORT_LABELS[k] for k in FACILITY_KEYS[:3])])
+    return buf.getvalue()
+
+
+def _copy_batch(cursor, batch):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in batch:
+        # NULL is an unquoted empty field in COPY's CSV format
+        writer.writerow(["" if row[c] is None else row[c] for c in STAGING_COLUMNS])
+    cursor.execute(_COPY_SQL, stream=io.BytesIO(buf.getvalue().encode("utf-8")))
+
+
+def import_file(engine, filename, data, admin, approve=False, dry_run=False):
+    """Validate and import an uploaded census file; returns an ``ImportResult``.
+
+    Valid rows are imported even when others fail; ``dry_run`` only validates.
+    Everything runs in one transaction, so a failure leaves no partial import.
+    """
+    with engine.begin() as conn:
+        return import_rows(conn, filename, data, admin, approve=approve, dry_run=dry_run)
+
+
+def import_rows(conn, filename, data, admin, approve=False, dry_run=False):
+    """``import_file`` inside the caller's transaction on ``conn``."""
+    start = time.perf_counter()
+    result = ImportResult()
+    seen = {}
+    lgas = {_normalize_name(name): (key, name) for key, name in
+            execute("import.lgas", conn, text("SELECT lga_key, lga_name FROM dwh.dim_lga"))}
+    cursor = None
+    if not dry_run:
+        conn.execute(_CREATE_STAGING_SQL)
+        # COPY goes through the DBAPI connection, inside the same transaction
+        cursor = conn.connection.cursor()
+
+    rows = iter_rows(filename, data)
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError("The file is empty")
+    positions = map_headers(header[1])
+
+    batch = []
+    for line, values in rows:
+        if not any(v not in (None, "") for v in values):
+            continue  # blank spreadsheet rows
+        result.rows_read += 1
+        row, errors = validate_row(values, positions, lgas)
+        if row is not None:
+            # The same school twice in one file is almost always a copy/paste slip
+            duplicate = seen.setdefault((row["lga_key"], _normalize_name(row["school_name"])), line)
+            if duplicate != line:
+                row, errors = None, [("school_name", row["school_name"], f"Duplicate of line {duplicate}")]
+        if row is None:
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.extend((line,) + e for e in errors)
+            continue
+        result.rows_valid += 1
+        row["line"] = line
+        batch.append(row)
+        if len(batch) == BATCH_ROWS:
+            if cursor is not None:
+                _copy_batch(cursor, batch)
+            batch = []
+    if batch and cursor is not None:
+        _copy_batch(cursor, batch)
+
+    if cursor is not None and result.rows_valid:
+        merged = execute("import.merge", conn, _MERGE_SQL).fetchall()
+        result.rows_imported = sum(r.n for r in merged)
+        result.new_schools = sum(r.new_schools for r in merged)
+        add_submission_counts(conn, {r.lga_key: r.new_schools for r in merged})
+        log_actions(conn, admin, "IMPORTED", [{}],
+                    details=f"{filename}: {result.rows_imported} rows, {result.rows_rejected} rejected")
+        if approve:
+            ids = [i for r in merged for i in r.ids]
+            result.approved = len(set_submission_status(conn, ids, True))
+            log_actions(conn, admin, "APPROVED", [{}], details=f"{result.approved} rows imported from {filename}")
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,12 @@
+"""One place to drop every cached view of the published (approved) data.
+
+Anything that changes which submissions are approved calls ``invalidate_published_data()``
+after its transaction commits, instead of clearing individual caches itself.
+"""
+from portal.dashboard import invalidate_dashboard
+from portal.kpis import invalidate_kpis
+
+
+def invalidate_published_data():
+    invalidate_kpis()
+    invalidate_dashboard()
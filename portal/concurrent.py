@@ -0,0 +1,66 @@
+"""Run independent read queries concurrently over the pooled engine.
+
+Pages that need several unrelated result sets (e.g. the Live Dashboard) otherwise
+pay one network round trip per query in sequence. ``run_queries`` submits them to a
+process-wide thread pool and waits for all of them, so the page costs roughly its
+slowest query. The pool is bounded by ``DB_QUERY_WORKERS`` (default 4) and each
+worker checks a connection out of the SQLAlchemy pool for the duration of one
+query, so concurrency never exceeds what ``DB_POOL_SIZE``/``DB_MAX_OVERFLOW`` allow.
+
+pg8000 is a blocking driver; a thread pool gives the same overlap as an async
+driver without a second engine and connection pool.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sqlalchemy import text
+
+from portal.config import get_setting
+from portal.querylog import read_sql
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """The shared query thread pool, created once per process."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_setting("DB_QUERY_WORKERS", 4, cast=int),
+                thread_name_prefix="db-query",
+            )
+    return _executor
+
+
+def _read(name, engine, sql, params):
+    statement = text(sql) if isinstance(sql, str) else sql
+    return read_sql(name, statement, engine, params=params)
+
+
+def _split(query):
+    if isinstance(query, tuple):
+        sql, params = query
+        return sql, params
+    return query, None
+
+
+def run_concurrently(*calls):
+    """Call each zero-argument callable on the pool and return their results in order.
+    The first failing call's exception is re-raised."""
+    if len(calls) <= 1:
+        # Nothing to overlap; skip the hand-off to a worker thread
+        return [call() for call in calls]
+    futures = [get_executor().submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def run_queries(engine, queries, prefix=""):
+    """Run ``{name: sql}`` or ``{name: (sql, params)}`` concurrently and return
+    ``{name: DataFrame}``. Each query is recorded in portal/querylog.py as
+    ``prefix + name``."""
+    names = list(queries)
+    results = run_concurrently(*[partial(_read, prefix + name, engine, *_split(queries[name])) for name in names])
+    return dict(zip(names, results))
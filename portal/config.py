@@ -0,0 +1,63 @@
+"""Runtime settings shared by the Streamlit app and the maintenance scripts.
+
+Values are looked up in the environment first, then in ``st.secrets`` (top level,
+then the optional section), so the same code works under ``streamlit run`` and
+from plain ``python`` scripts such as ``database_setup.py``.
+
+Parsing secrets.toml makes Streamlit copy its top-level keys into ``os.environ``,
+overwriting variables that were already set. ``_secrets`` undoes that, so an
+explicit ``DB_NAME=... python -m ...`` still wins. (``streamlit run`` loads the file
+before the app is imported; there, set overrides in the environment of the server's
+host instead of keeping the same key in secrets.toml.)
+"""
+import os
+import threading
+
+_TRUE = {"1", "true", "yes", "on"}
+
+_secrets_lock = threading.Lock()
+_secrets_loaded = False
+
+
+def _secrets():
+    """``st.secrets``, parsed once with any environment variables it overwrote restored."""
+    global _secrets_loaded
+    import streamlit as st
+    secrets = st.secrets
+    if not _secrets_loaded:
+        with _secrets_lock:
+            if not _secrets_loaded:
+                before = dict(os.environ)
+                try:
+                    secrets.load_if_toml_exists()
+                finally:
+                    for key, value in before.items():
+                        if os.environ.get(key) != value:
+                            os.environ[key] = value
+                    _secrets_loaded = True
+    return secrets
+
+
+def _from_secrets(name, section=None):
+    try:
+        secrets = _secrets()
+        if name in secrets:
+            return secrets[name]
+        if section and section in secrets and name in secrets[section]:
+            return secrets[section][name]
+    except Exception:
+        # No secrets.toml (or not running inside Streamlit) — fall through to default
+        pass
+    return None
+
+
+def get_setting(name, default=None, section=None, cast=None):
+    """Return setting ``name`` converted with ``cast``, or ``default`` when unset."""
+    value = os.getenv(name)
+    if value is None:
+        value = _from_secrets(name, section)
+    if value is None or value == "":
+        return default
+    if cast is bool:
+        return value if isinstance(value, bool) else str(value).strip().lower() in _TRUE
+    return cast(value) if cast else value
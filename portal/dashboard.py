@@ -0,0 +1,85 @@
+"""Data layer for the Live Dashboard: every dataset the page shows, computed together
+and cached once for all sessions.
+
+``get_dashboard_data`` keys the cache on the published-data version from
+``dwh.data_version`` (portal/dataversion.py), so any number of open dashboards share
+one snapshot per version and the queries run once per change instead of once per
+viewer per refresh. The version itself is cached for ``DATA_VERSION_TTL`` seconds
+(default 5), which caps the polling cost at one primary-key lookup per interval per
+process; ``invalidate_dashboard()`` (via ``portal.cache``) drops it so this process
+sees its own approvals at once. ``DASHBOARD_CACHE_TTL`` (default 600) only covers the
+sliding 7-day window.
+"""
+from portal.concurrent import run_queries
+from portal.config import get_setting
+from portal.dataversion import read_data_version
+from portal.querylog import cached_query
+
+# The 17 pre-aggregated LGA rows kept up to date by portal/aggregates.py
+LGA_SQL = """
+    SELECT l.lga_name,
+           COALESCE(f.enrollment_total,0) AS students,
+           COALESCE(f.teachers_total,0) AS teachers,
+           ROUND(COALESCE(f.enrollment_total::NUMERIC / NULLIF(f.teachers_total,0),999),1) AS ratio,
+           COALESCE(f.school_count,0) AS schools
+    FROM dwh.dim_lga l
+    LEFT JOIN dwh.fact_abia_metrics f ON f.lga_key = l.lga_key
+    ORDER BY students DESC
+"""
+
+FACILITY_SQL = """
+    SELECT l.lga_name,
+           f.school_count AS total_schools,
+           f.school_count - f.boys_toilet_count AS missing_boys_toilet,
+           f.school_count - f.water_count AS missing_water
+    FROM dwh.fact_abia_metrics f
+    JOIN dwh.dim_lga l ON l.lga_key = f.lga_key
+    WHERE f.school_count > 0
+"""
+
+RECENT_SQL = """
+    SELECT DATE(submitted_at) AS date, COUNT(*) AS count
+    FROM school_submissions
+    WHERE approved = TRUE AND submitted_at >= NOW() - INTERVAL '7 days'
+    GROUP BY date ORDER BY date
+"""
+
+DASHBOARD_POLL_SECONDS = get_setting("DASHBOARD_POLL_SECONDS", 10, cast=int)
+
+
+@cached_query("dashboard.data_version", ttl=get_setting("DATA_VERSION_TTL", 5, cast=int), show_spinner=False)
+def data_version(_engine):
+    return read_data_version(_engine)
+
+
+def compute_dashboard(engine):
+    """Run the dashboard queries and return ``{"lgas", "total_schools", "facilities", "recent"}``."""
+    # Independent queries, run side by side on the shared query pool
+    frames = run_queries(engine, {"lgas": LGA_SQL, "facilities": FACILITY_SQL, "recent": RECENT_SQL},
+                         prefix="dashboard.")
+    return {
+        "lgas": frames["lgas"],
+        # Verified schools come from the same rollup rows instead of a COUNT(*) scan
+        "total_schools": int(frames["lgas"]["schools"].sum()),
+        "facilities": frames["facilities"],
+        "recent": frames["recent"],
+    }
+
+
+@cached_query("dashboard.snapshot", ttl=get_setting("DASHBOARD_CACHE_TTL", 600, cast=int), max_entries=4,
+              show_spinner=False)
+def _cached_dashboard(_engine, version):
+    return compute_dashboard(_engine)
+
+
+def get_dashboard_data(engine, version=None):
+    """The dashboard snapshot for ``version`` (default: current), shared by all sessions."""
+    if version is None:
+        version = data_version(engine)
+    return _cached_dashboard(engine, version)
+
+
+def invalidate_dashboard():
+    """Re-read the data version on the next request (the snapshot key follows it)."""
+    data_version.clear()
+    _cached_dashboard.clear()
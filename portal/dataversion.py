@@ -0,0 +1,30 @@
+"""Monotonic version number of the published (approved) data.
+
+``dwh.data_version`` holds a single row whose ``version`` is incremented in the same
+transaction as every change to what the public pages show (approve/reject, aggregate
+rebuilds). Reading it is a primary-key lookup, so open dashboards can poll it every
+few seconds and only rerun their queries when it has actually moved; the counter
+lives in Postgres, so it also works across several app processes.
+"""
+from sqlalchemy import text
+
+from portal.querylog import execute
+
+_BUMP_SQL = text("""
+    UPDATE dwh.data_version
+    SET version = version + 1, changed_at = NOW()
+    WHERE id = 1
+    RETURNING version
+""")
+
+_READ_SQL = text("SELECT version FROM dwh.data_version WHERE id = 1")
+
+
+def bump_data_version(conn):
+    """Increment the version inside ``conn``'s transaction and return the new value."""
+    return execute("data_version.bump", conn, _BUMP_SQL).scalar()
+
+
+def read_data_version(engine):
+    with engine.connect() as conn:
+        return execute("data_version.read", conn, _READ_SQL).scalar() or 0
@@ -0,0 +1,143 @@
+"""Process-wide pooled SQLAlchemy engine.
+
+Streamlit re-executes ``app.py`` on every widget interaction, but imported modules
+stay loaded, so the engine kept here is created once per worker process and shared
+by every session (and by the maintenance scripts). Pool behaviour is configurable
+through secrets / environment variables:
+
+    DB_POOL_SIZE            persistent connections kept open        (default 5)
+    DB_MAX_OVERFLOW         extra connections allowed under bursts  (default 10)
+    DB_POOL_TIMEOUT         seconds to wait for a free connection   (default 30)
+    DB_POOL_RECYCLE         seconds before a connection is replaced (default 1800)
+    DB_POOL_PRE_PING        test connections before handing them out (default true)
+    DB_STATEMENT_TIMEOUT_MS server-side statement_timeout, 0 = off  (default 15000)
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from portal.config import get_setting
+
+_engine = None
+_engine_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "timeouts": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+}
+
+
+def _bump(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check a connection out."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            _bump("timeouts")
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with _stats_lock:
+                _stats["wait_seconds_total"] += waited
+                _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], waited)
+
+
+def get_database_url():
+    """Build the pg8000 URL from settings, or return None if credentials are missing."""
+    user = get_setting("DB_USER")
+    password = get_setting("DB_PASSWORD")
+    host = get_setting("DB_HOST")
+    port = get_setting("DB_PORT", "5432")
+    name = get_setting("DB_NAME")
+    if not all([user, password, host, name]):
+        return None
+    return f"postgresql+pg8000://{user}:{password}@{host}:{port}/{name}"
+
+
+def _install_listeners(engine, statement_timeout_ms):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        _bump("connects")
+        if statement_timeout_ms:
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"SET statement_timeout = {int(statement_timeout_ms)}")
+            cursor.close()
+            # pg8000 opens an implicit transaction; commit so the pool's reset-on-return
+            # rollback doesn't undo the SET
+            dbapi_conn.commit()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(_dbapi_conn, _record, _proxy):
+        _bump("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(_dbapi_conn, _record):
+        _bump("checkins")
+
+
+def get_engine():
+    """Return the shared engine, creating it on first use. None if not configured."""
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is None:
+            url = get_database_url()
+            if not url:
+                return None
+            engine = create_engine(
+                url,
+                poolclass=MeteredQueuePool,
+                pool_size=get_setting("DB_POOL_SIZE", 5, cast=int),
+                max_overflow=get_setting("DB_MAX_OVERFLOW", 10, cast=int),
+                pool_timeout=get_setting("DB_POOL_TIMEOUT", 30, cast=float),
+                pool_recycle=get_setting("DB_POOL_RECYCLE", 1800, cast=int),
+                pool_pre_ping=get_setting("DB_POOL_PRE_PING", True, cast=bool),
+            )
+            _install_listeners(engine, get_setting("DB_STATEMENT_TIMEOUT_MS", 15000, cast=int))
+            _engine = engine
+    return _engine
+
+
+def dispose_engine():
+    """Close every pooled connection and forget the engine (scripts, tests, forks)."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def pool_stats():
+    """Snapshot of pool occupancy plus cumulative checkout/wait counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    checkouts = stats["checkouts"] or 1
+    stats["wait_ms_avg"] = round(stats["wait_seconds_total"] * 1000 / checkouts, 2)
+    stats["wait_ms_max"] = round(stats.pop("wait_seconds_max") * 1000, 2)
+    stats["wait_ms_total"] = round(stats.pop("wait_seconds_total") * 1000, 2)
+    engine = _engine
+    if engine is not None:
+        pool = engine.pool
+        stats.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    return stats
@@ -0,0 +1,110 @@
+"""Streaming dataset export (Excel, CSV, Parquet).
+
+Rows are read through a server-side cursor in ``EXPORT_CHUNK_ROWS`` chunks and
+written straight to a ``SpooledTemporaryFile`` (kept in memory while small, spilled
+to disk beyond ``SPOOL_MAX_BYTES``), so only one chunk of the dataset is held in
+pandas at a time. Excel output uses xlsxwriter's ``constant_memory`` mode.
+``export_query`` returns the finished file as bytes, the form ``st.download_button``
+accepts (it rejects temporary-file objects).
+"""
+import io
+import tempfile
+
+import pandas as pd
+
+EXPORT_CHUNK_ROWS = 5000
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_NAME = "Abia_Education_Data"
+
+FORMATS = {
+    "Excel (.xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV (.csv)": ("csv", "text/csv"),
+    "Parquet (.parquet)": ("parquet", "application/octet-stream"),
+}
+
+
+def iter_chunks(engine, statement, params=None, chunksize=EXPORT_CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunksize`` rows from a server-side cursor."""
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as conn:
+        for chunk in pd.read_sql(statement, conn, params=params or {}, chunksize=chunksize):
+            yield chunk
+
+
+def _cells(chunk):
+    """Rows of plain Python values with NaN/NaT turned into None."""
+    return chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def write_xlsx(chunks, out):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(out, {
+        "constant_memory": True,
+        "remove_timezone": True,
+        "default_date_format": "yyyy-mm-dd hh:mm",
+    })
+    header_format = workbook.add_format({"bold": True, "bg_color": "#006400", "font_color": "white"})
+    worksheet, row_no, columns = None, 0, None
+
+    def new_sheet():
+        index = len(workbook.worksheets()) + 1
+        sheet = workbook.add_worksheet(SHEET_NAME if index == 1 else f"{SHEET_NAME}_{index}")
+        for col_num, col_name in enumerate(columns):
+            sheet.write(0, col_num, col_name, header_format)
+            sheet.set_column(col_num, col_num, 20)
+        return sheet
+
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            worksheet, row_no = new_sheet(), 1
+        for values in _cells(chunk):
+            # Excel caps a sheet at ~1M rows — continue on a fresh sheet
+            if row_no >= EXCEL_MAX_ROWS:
+                worksheet, row_no = new_sheet(), 1
+            worksheet.write_row(row_no, 0, values)
+            row_no += 1
+
+    if worksheet is None:
+        workbook.add_worksheet(SHEET_NAME)
+    workbook.close()
+
+
+def write_csv(chunks, out):
+    writer = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    first = True
+    for chunk in chunks:
+        chunk.to_csv(writer, header=first, index=False)
+        first = False
+    writer.flush()
+    writer.detach()  # leave ``out`` open for the caller
+
+
+def write_parquet(chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, schema = None, None
+    for chunk in chunks:
+        if writer is None:
+            inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+            # A column that is all-NULL in the first chunk would be typed "null"; widen to string
+            schema = pa.schema([
+                pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in inferred
+            ])
+            writer = pq.ParquetWriter(out, schema)
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    if writer is not None:
+        writer.close()
+
+
+_WRITERS = {"xlsx": write_xlsx, "csv": write_csv, "parquet": write_parquet}
+
+
+def export_query(engine, statement, params=None, fmt="xlsx"):
+    """Stream a query into a spooled temp file and return its contents as bytes."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+        _WRITERS[fmt](iter_chunks(engine, statement, params), out)
+        out.seek(0)
+        return out.read()
@@ -0,0 +1,147 @@
+"""Facility codec: the single source of truth for facility labels, bits and badges.
+
+Each facility has a stable ``key`` (used for column names such as
+``dwh.fact_abia_metrics.water_count``), the full ``label`` shown in the form, a
+canonical short label for badges and a bit in ``school_submissions.facilities_mask``.
+The bit positions are persisted, so new facilities must be appended to the end of
+``FACILITIES``.
+
+Pages decode a whole result set once with ``decode_frame`` right after the query;
+render loops then only read the precomputed ``facility_mask`` / ``badges`` columns.
+"""
+import ast
+import json
+from functools import lru_cache
+
+import pandas as pd
+
+FACILITIES = [
+    ("boys_toilet", "Functional Toilets (Boys)"),
+    ("girls_toilet", "Functional Toilets (Girls)"),
+    ("water", "Clean Drinking Water"),
+    ("electricity", "Electricity / Solar Power"),
+    ("desks", "Enough Desks & Chairs (80%+ students seated)"),
+    ("fencing", "Perimeter Fencing"),
+    ("classrooms", "Functional Classrooms (no leaking roof)"),
+    ("ict_lab", "Computer Lab / ICT Center"),
+]
+
+FACILITY_KEYS = [key for key, _ in FACILITIES]
+FACILITY_OPTIONS = [label for _, label in FACILITIES]
+FACILITY_BITS = {key: 1 << position for position, key in enumerate(FACILITY_KEYS)}
+
+# Badge text shown on School Lookup cards and in the Admin Panel
+SHORT_LABELS = {
+    "boys_toilet": "Boys Toilet",
+    "girls_toilet": "Girls Toilet",
+    "water": "Water",
+    "electricity": "Electricity",
+    "desks": "Desks",
+    "fencing": "Fencing",
+    "classrooms": "Classrooms",
+    "ict_lab": "ICT Lab",
+}
+
+_BIT_BY_LABEL = {label: FACILITY_BITS[key] for key, label in FACILITIES}
+
+
+def encode_facilities(labels):
+    """Bitmask for a list of facility labels (unknown labels are ignored)."""
+    mask = 0
+    for label in labels or []:
+        mask |= _BIT_BY_LABEL.get(str(label).strip().rstrip("."), 0)
+    return mask
+
+
+def decode_facilities(mask):
+    """Facility labels whose bit is set in ``mask``, in form order."""
+    mask = int(mask or 0)
+    return [label for key, label in FACILITIES if mask & FACILITY_BITS[key]]
+
+
+# Every possible mask maps to a ready-made badge tuple, so render loops only index
+BADGES_BY_MASK = tuple(
+    tuple(SHORT_LABELS[key] for key in FACILITY_KEYS if mask & FACILITY_BITS[key])
+    for mask in range(1 << len(FACILITY_KEYS))
+)
+
+
+# (short label, working?) for every facility, per mask — drives the Admin Panel grid
+CHECKLIST_BY_MASK = tuple(
+    tuple((SHORT_LABELS[key], bool(mask & FACILITY_BITS[key])) for key in FACILITY_KEYS)
+    for mask in range(1 << len(FACILITY_KEYS))
+)
+
+
+def badges_for_mask(mask):
+    """Short labels of the working facilities in ``mask``."""
+    return BADGES_BY_MASK[int(mask or 0) & (len(BADGES_BY_MASK) - 1)]
+
+
+def checklist_for_mask(mask):
+    """``(short_label, working)`` pairs for every facility, in form order."""
+    return CHECKLIST_BY_MASK[int(mask or 0) & (len(CHECKLIST_BY_MASK) - 1)]
+
+
+@lru_cache(maxsize=4096)
+def mask_from_raw(raw):
+    """Bitmask for a legacy ``facilities`` value (JSON text or old Python repr).
+
+    Memoized by the raw string: most rows share a handful of distinct values.
+    """
+    if not raw:
+        return 0
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            labels = parse(raw)
+        except Exception:
+            continue
+        return encode_facilities(labels) if isinstance(labels, (list, tuple)) else 0
+    return 0
+
+
+def decode_frame(df, mask_col="facilities_mask", raw_col="facilities"):
+    """Add ``facility_mask`` and ``badges`` columns to ``df`` in one vectorized pass.
+
+    The stored bitmask is used when present; rows that predate it fall back to the
+    legacy ``raw_col`` text, parsed once per distinct value.
+    """
+    if df.empty:
+        df["facility_mask"] = []
+        df["badges"] = []
+        return df
+    if mask_col in df:
+        masks = df[mask_col].fillna(0).astype(int)
+    else:
+        masks = pd.Series(0, index=df.index)
+    if raw_col in df:
+        missing = masks == 0
+        if missing.any():
+            raw = df.loc[missing, raw_col].map(lambda v: v if isinstance(v, str) or v is None else json.dumps(v))
+            masks = masks.copy()
+            masks.loc[missing] = raw.map(mask_from_raw)
+    df["facility_mask"] = masks.astype(int)
+    df["badges"] = df["facility_mask"].map(badges_for_mask)
+    return df
+
+
+def count_column(key):
+    """Name of the per-LGA counter column for facility ``key``."""
+    return f"{key}_count"
+
+
+def has_facility_sql(key, alias="s"):
+    """SQL boolean expression: submission ``alias`` reports facility ``key`` as working."""
+    return f"({alias}.facilities_mask & {FACILITY_BITS[key]}) <> 0"
+
+
+def mask_from_text_sql(column="facilities"):
+    """SQL expression deriving the bitmask from a legacy text/JSON facilities column.
+
+    Only used by the one-off migration in ``database_setup.py``; the label substrings
+    appear whether the row holds JSON or the old Python ``str(list)`` repr.
+    """
+    return " | ".join(
+        f"(CASE WHEN strpos(COALESCE({column}::text, ''), '{label}') > 0 THEN {FACILITY_BITS[key]} ELSE 0 END)"
+        for key, label in FACILITIES
+    )
@@ -0,0 +1,80 @@
+"""Upload-time processing of proof photos.
+
+Phone photos arrive as multi-megabyte JPEG/PNG files with EXIF rotation flags and
+metadata (often GPS). ``ingest_photo`` validates the upload, applies the EXIF
+orientation, drops all metadata, downsizes the original to ``MAX_DIMENSION`` and
+stores it plus a small fixed-size thumbnail for list views (WebP when Pillow
+supports it) in the content-addressed blob store.
+"""
+import io
+
+from PIL import Image, ImageOps, features
+
+from portal.blobstore import put_blob
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+MAX_DIMENSION = 1600
+JPEG_QUALITY = 85
+THUMB_SIZE = (400, 300)
+THUMB_QUALITY = 75
+ALLOWED_FORMATS = {"JPEG", "MPO", "PNG", "WEBP"}
+
+
+class InvalidImage(ValueError):
+    """The upload is not an acceptable photo."""
+
+
+def _open_validated(data):
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise InvalidImage(f"Photo is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+    try:
+        probe = Image.open(io.BytesIO(data))
+        fmt = probe.format
+        probe.verify()  # cheap structural check; the image must be reopened afterwards
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Image.DecompressionBombError:
+        raise InvalidImage("Photo dimensions are too large")
+    except Exception:
+        raise InvalidImage("File is not a readable image")
+    if fmt not in ALLOWED_FORMATS:
+        raise InvalidImage(f"Unsupported image format: {fmt}")
+    return image
+
+
+def _to_rgb(image):
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        # Flatten transparency onto white rather than black
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def process_photo(data):
+    """Return ``(original_bytes, original_ext, thumb_bytes, thumb_ext)`` for raw upload bytes."""
+    image = _to_rgb(ImageOps.exif_transpose(_open_validated(data)))
+
+    original = image.copy()
+    original.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+    original_buf = io.BytesIO()
+    # No exif= argument: metadata (GPS, device) is not written back
+    original.save(original_buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    thumb = ImageOps.fit(image, THUMB_SIZE, Image.LANCZOS)
+    thumb_buf = io.BytesIO()
+    if features.check("webp"):
+        thumb.save(thumb_buf, "WEBP", quality=THUMB_QUALITY, method=4)
+        thumb_ext = "webp"
+    else:
+        thumb.save(thumb_buf, "JPEG", quality=THUMB_QUALITY, optimize=True)
+        thumb_ext = "jpg"
+
+    return original_buf.getvalue(), "jpg", thumb_buf.getvalue(), thumb_ext
+
+
+def ingest_photo(data):
+    """Process an upload and store both renditions. Returns ``(photo_ref, thumb_ref)``."""
+    original, ext, thumb, thumb_ext = process_photo(data)
+    return put_blob(original, ext), put_blob(thumb, thumb_ext)
@@ -0,0 +1,33 @@
+"""Headline numbers for the Home page, computed in one round trip and cached.
+
+The snapshot is held in Streamlit's process-wide data cache, so every session shares
+it; admin approve/reject handlers call ``invalidate_kpis()`` so new numbers show up
+immediately instead of waiting for the TTL (``KPI_CACHE_TTL`` seconds, default 300).
+The numbers come from the 17 per-LGA fact rows, which count each school's current
+record once (portal/aggregates.py, portal/schools.py).
+"""
+from portal.config import get_setting
+from portal.querylog import cached_query, read_sql
+
+KPI_SQL = """
+    SELECT COALESCE(SUM(school_count),0)       AS total_schools,
+           COALESCE(SUM(enrollment_total),0)   AS total_students,
+           COALESCE(SUM(teachers_total),0)     AS total_teachers,
+           COUNT(*) FILTER (WHERE school_count > 0) AS total_lgas
+    FROM dwh.fact_abia_metrics
+"""
+
+
+def compute_kpis(engine):
+    """Run the single KPI query and return a plain dict of ints."""
+    row = read_sql("home.kpis", KPI_SQL, engine).iloc[0]
+    return {key: int(row[key]) for key in row.index}
+
+
+@cached_query("home.kpis", ttl=get_setting("KPI_CACHE_TTL", 300, cast=int), show_spinner=False)
+def get_home_kpis(_engine):
+    return compute_kpis(_engine)
+
+
+def invalidate_kpis():
+    get_home_kpis.clear()
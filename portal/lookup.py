@@ -0,0 +1,47 @@
+"""One page of School Lookup cards at a time.
+
+Only each school's current record is shown (portal/schools.py). Browsing walks them
+alphabetically with a ``(school_name, id)`` keyset cursor; searching pages through
+the ranked trigram results. Either way only ``CARDS_PER_PAGE`` rows leave the
+database, decoded once with their facility badges.
+"""
+from sqlalchemy import text
+
+from portal.facilities import decode_frame
+from portal.querylog import read_sql
+from portal.schools import is_current_sql
+from portal.search import search_submissions
+
+CARDS_PER_PAGE = 12
+
+CARD_COLUMNS = """
+    id, school_name, lga_name, enrollment_total, teachers_total, photo_path, thumb_path, facilities_mask
+"""
+
+
+def browse_page(engine, cursor=None, limit=CARDS_PER_PAGE):
+    """Approved schools after ``cursor`` = ``(school_name, id)``. Returns ``(df, next_cursor)``."""
+    where = f"approved = TRUE AND {is_current_sql()}"
+    params = {"limit": limit + 1}
+    if cursor is not None:
+        where += " AND (school_name, id) > (:cursor_name, :cursor_id)"
+        params["cursor_name"], params["cursor_id"] = cursor
+    df = read_sql("lookup.browse", text(f"""
+        SELECT {CARD_COLUMNS}
+        FROM school_submissions
+        WHERE {where}
+        ORDER BY school_name, id
+        LIMIT :limit
+    """), engine, params=params)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit].copy()
+        next_cursor = (df.iloc[-1]["school_name"], int(df.iloc[-1]["id"]))
+    return decode_frame(df), next_cursor
+
+
+def search_page(engine, term, page_no=0, limit=CARDS_PER_PAGE):
+    """Page ``page_no`` (0-based) of ranked search hits. Returns ``(df, has_next)``."""
+    df = search_submissions(engine, term, limit=limit + 1, offset=page_no * limit, columns=CARD_COLUMNS)
+    has_next = len(df) > limit
+    return decode_frame(df.iloc[:limit].copy()), has_next
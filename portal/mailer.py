@@ -0,0 +1,288 @@
+"""Durable outbound email: an ``email_outbox`` table plus a background sender.
+
+Pages call ``enqueue_email`` (one INSERT, returns immediately). A daemon thread per
+worker process — or a dedicated ``python -m portal.mailer`` process — claims batches
+with ``FOR UPDATE SKIP LOCKED``, sends them over one reused SMTP_SSL login, retries
+failures with exponential backoff and stays under the provider's quota. Both limits
+are counted from the outbox itself, under an advisory lock, so they hold across all
+sender threads and processes together.
+
+Settings (env / secrets, top level or ``[EMAIL]`` section):
+
+    EMAIL_USER, EMAIL_PASSWORD   SMTP login
+    SMTP_SERVER, SMTP_PORT       default smtp.gmail.com:465
+    EMAIL_RATE_PER_MINUTE        default 20
+    EMAIL_DAILY_QUOTA            default 500 (Gmail personal-account limit)
+    EMAIL_BATCH_SIZE             default 20
+    EMAIL_MAX_ATTEMPTS           default 6
+    EMAIL_SENDER_IN_APP          start the sender thread inside Streamlit (default true)
+"""
+import logging
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from sqlalchemy import text
+
+from portal import db
+from portal.config import get_setting
+
+log = logging.getLogger(__name__)
+
+POLL_SECONDS = 5
+IDLE_DISCONNECT_SECONDS = 60
+NOOP_AFTER_IDLE_SECONDS = 10
+STALE_CLAIM_MINUTES = 10
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+_INSERT_SQL = text("""
+    INSERT INTO email_outbox (to_email, subject, body)
+    VALUES (:to_email, :subject, :body)
+""")
+
+_CLAIM_SQL = text(f"""
+    UPDATE email_outbox
+    SET status = 'sending', attempts = attempts + 1, locked_at = NOW()
+    WHERE id IN (
+        SELECT id FROM email_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND locked_at < NOW() - INTERVAL '{STALE_CLAIM_MINUTES} minutes'
+               AND attempts < :max_attempts)
+        ORDER BY id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, to_email, subject, body, attempts
+""")
+
+# A sender died mid-send on the last allowed attempt; the message may have gone out,
+# so it is not tried again
+_ABANDON_SQL = text(f"""
+    UPDATE email_outbox
+    SET status = 'failed', last_error = 'Sender stopped while sending the last attempt'
+    WHERE status = 'sending' AND locked_at < NOW() - INTERVAL '{STALE_CLAIM_MINUTES} minutes'
+      AND attempts >= :max_attempts
+""")
+
+_SENT_SQL = text("UPDATE email_outbox SET status = 'sent', sent_at = NOW(), last_error = NULL WHERE id = :id")
+
+_RETRY_SQL = text("""
+    UPDATE email_outbox
+    SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+        next_attempt_at = NOW() + make_interval(secs => :delay),
+        last_error = :error
+    WHERE id = :id
+""")
+
+# Serializes claims across processes, so two senders cannot both see free quota
+_CLAIM_LOCK_KEY = 7160301
+_CLAIM_LOCK_SQL = text("SELECT pg_advisory_xact_lock(:key)")
+
+# Sent in the last day, and sent or claimed (in flight) in the last minute
+_SENT_RECENTLY_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM email_outbox
+         WHERE status = 'sent' AND sent_at > NOW() - INTERVAL '1 day') AS day,
+        (SELECT COUNT(*) FROM email_outbox
+         WHERE status = 'sent' AND sent_at > NOW() - INTERVAL '1 minute')
+      + (SELECT COUNT(*) FROM email_outbox
+         WHERE status = 'sending' AND locked_at > NOW() - INTERVAL '1 minute') AS minute
+""")
+
+
+def _email_setting(name, default=None, cast=None):
+    return get_setting(name, default, section="EMAIL", cast=cast)
+
+
+# ===================== PRODUCER SIDE =====================
+def enqueue_email(to_email, subject, body, conn=None):
+    """Queue one message. Pass ``conn`` to make it part of the caller's transaction."""
+    return enqueue_many([(to_email, subject, body)], conn=conn)
+
+
+def enqueue_many(messages, conn=None):
+    """Queue ``(to_email, subject, body)`` tuples in one batched INSERT."""
+    rows = [{"to_email": t, "subject": s, "body": b} for t, s, b in messages if t]
+    if not rows:
+        return 0
+    if conn is not None:
+        conn.execute(_INSERT_SQL, rows)
+    else:
+        with db.get_engine().begin() as own_conn:
+            own_conn.execute(_INSERT_SQL, rows)
+    if _email_setting("EMAIL_SENDER_IN_APP", True, cast=bool):
+        ensure_sender_running()
+    _wake.set()
+    return len(rows)
+
+
+# ===================== SENDER SIDE =====================
+class _RateLimiter:
+    """Token bucket: at most ``per_minute`` sends, refilled continuously. Paces one
+    process; the cluster-wide limit is enforced when claiming (``process_batch``)."""
+
+    def __init__(self, per_minute):
+        self.capacity = max(per_minute, 1)
+        self.tokens = float(self.capacity)
+        self.refill_per_second = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.refill_per_second)
+
+
+class SmtpSession:
+    """One authenticated SMTP_SSL connection, reopened only when it drops.
+
+    A connection that sat idle is checked with NOOP before a message goes out and
+    reopened if the server has closed it. The message itself is handed over once:
+    an error after that may come after the server accepted it, so it goes back to
+    the outbox's retry/backoff rather than being resent here.
+    """
+
+    def __init__(self):
+        self.user = _email_setting("EMAIL_USER")
+        self.password = _email_setting("EMAIL_PASSWORD")
+        self.server = _email_setting("SMTP_SERVER", "smtp.gmail.com")
+        self.port = _email_setting("SMTP_PORT", 465, cast=int)
+        self._smtp = None
+        self.last_used = 0.0
+
+    def _connect(self):
+        self.close()
+        smtp = smtplib.SMTP_SSL(self.server, self.port, timeout=30)
+        smtp.login(self.user, self.password)
+        self._smtp = smtp
+
+    def send(self, to_email, subject, body):
+        msg = MIMEMultipart()
+        msg['From'] = self.user
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+
+        if self._smtp is not None and time.monotonic() - self.last_used > NOOP_AFTER_IDLE_SECONDS:
+            try:
+                alive = self._smtp.noop()[0] == 250
+            except (smtplib.SMTPServerDisconnected, OSError):
+                alive = False
+            if not alive:
+                # Server closed the idle connection — log in again below
+                self.close()
+        if self._smtp is None:
+            self._connect()
+        self._smtp.send_message(msg)
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+
+def _backoff_seconds(attempts):
+    return min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+
+
+def process_batch(engine, session, limiter, batch_size=None):
+    """Claim and send one batch. Returns the number of messages attempted."""
+    batch_size = batch_size or _email_setting("EMAIL_BATCH_SIZE", 20, cast=int)
+    max_attempts = _email_setting("EMAIL_MAX_ATTEMPTS", 6, cast=int)
+    daily_quota = _email_setting("EMAIL_DAILY_QUOTA", 500, cast=int)
+    per_minute = _email_setting("EMAIL_RATE_PER_MINUTE", 20, cast=int)
+
+    with engine.begin() as conn:
+        conn.execute(_CLAIM_LOCK_SQL, {"key": _CLAIM_LOCK_KEY})
+        recent = conn.execute(_SENT_RECENTLY_SQL).one()
+        remaining = min(daily_quota - recent.day, per_minute - recent.minute)
+        conn.execute(_ABANDON_SQL, {"max_attempts": max_attempts})
+        if remaining <= 0:
+            return 0
+        claimed = conn.execute(_CLAIM_SQL, {
+            "limit": min(batch_size, remaining),
+            "max_attempts": max_attempts,
+        }).fetchall()
+
+    for row in claimed:
+        limiter.acquire()
+        try:
+            session.send(row.to_email, row.subject, row.body)
+        except Exception as e:
+            log.warning("Email %s to %s failed (attempt %s): %s", row.id, row.to_email, row.attempts, e)
+            with engine.begin() as conn:
+                conn.execute(_RETRY_SQL, {
+                    "id": row.id,
+                    "max_attempts": max_attempts,
+                    "delay": _backoff_seconds(row.attempts),
+                    "error": str(e)[:500],
+                })
+            session.close()
+            continue
+        with engine.begin() as conn:
+            conn.execute(_SENT_SQL, {"id": row.id})
+    return len(claimed)
+
+
+def run_sender(stop_event=None):
+    """Sender loop: drain the outbox, then sleep until woken or the poll interval passes."""
+    stop_event = stop_event or threading.Event()
+    session = SmtpSession()
+    limiter = _RateLimiter(_email_setting("EMAIL_RATE_PER_MINUTE", 20, cast=int))
+    while not stop_event.is_set():
+        engine = db.get_engine()
+        try:
+            sent = process_batch(engine, session, limiter) if engine else 0
+        except Exception as e:
+            log.error("Email sender error: %s", e)
+            sent = 0
+        if sent:
+            continue
+        if session.last_used and time.monotonic() - session.last_used > IDLE_DISCONNECT_SECONDS:
+            session.close()
+            session.last_used = 0.0
+        _wake.wait(POLL_SECONDS)
+        _wake.clear()
+    session.close()
+
+
+_wake = threading.Event()
+_sender_thread = None
+_sender_lock = threading.Lock()
+
+
+def ensure_sender_running():
+    """Start the background sender thread once per process."""
+    global _sender_thread
+    with _sender_lock:
+        if _sender_thread is None or not _sender_thread.is_alive():
+            _sender_thread = threading.Thread(target=run_sender, name="email-outbox-sender", daemon=True)
+            _sender_thread.start()
+
+
+def outbox_stats(engine):
+    """Counts per status, for the Admin Panel."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT status, COUNT(*) FROM email_outbox GROUP BY status")).fetchall()
+    return {status: count for status, count in rows}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print("📧 Email outbox sender running (Ctrl+C to stop)...")
+    try:
+        run_sender()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,290 @@
+"""Per-query instrumentation: latency histograms, row counts, errors, cache hits,
+and a slow-query log with EXPLAIN plans.
+
+Every page query goes through ``read_sql`` / ``execute`` with a stable dotted name
+(``"dashboard.lgas"``, ``"users.by_email"``, ...); cached loaders use
+``cached_query`` instead of ``st.cache_data`` so hits and misses are counted under
+the same name. Statistics are kept per process and shown in **Admin Panel → Query
+Metrics**; when ``METRICS_PORT`` is set, ``start_metrics_server`` also serves them in
+Prometheus text format on ``http://<METRICS_HOST>:<port>/metrics`` (``METRICS_HOST``
+defaults to 127.0.0.1; set it to 0.0.0.0 for a scraper on another machine).
+
+Queries slower than ``SLOW_QUERY_MS`` (default 1000) are logged with their plan
+from ``EXPLAIN`` (not ``EXPLAIN ANALYZE``: the statement is not run a second time).
+The EXPLAIN runs on its own short-lived connection, outside the caller's transaction.
+"""
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from portal.config import get_setting
+from portal.db import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOW_QUERY_MS = get_setting("SLOW_QUERY_MS", 1000, cast=int)
+SLOW_LOG_SIZE = 50
+EXPLAIN_LOCK_TIMEOUT_MS = 1000
+
+
+class QueryStats:
+    """Counters for one query name."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def observe(self, seconds, rows):
+        self.count += 1
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+        if rows is not None and rows >= 0:
+            self.rows += rows
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+_stats = {}
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get(name):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats.setdefault(name, QueryStats())
+    return stats
+
+
+def _record(name, seconds, rows=None, error=False):
+    with _lock:
+        stats = _get(name)
+        if error:
+            stats.errors += 1
+        else:
+            stats.observe(seconds, rows)
+
+
+def record_cache(name, hit):
+    with _lock:
+        stats = _get(name)
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+def _explain(con, sql, params):
+    """Plain EXPLAIN of ``sql`` with the same parameters, as text (best effort).
+
+    Never runs on the caller's connection: an error there would abort the caller's
+    transaction. A separate connection cannot see the caller's uncommitted rows, and
+    ``lock_timeout`` stops it from waiting on locks the caller holds.
+    """
+    try:
+        if isinstance(sql, str):
+            run = lambda c: c.exec_driver_sql("EXPLAIN " + sql)
+        else:
+            statement = text("EXPLAIN " + sql.text).bindparams(*sql._bindparams.values())
+            run = lambda c: c.execute(statement, params or {})
+        engine = con if isinstance(con, Engine) else con.engine
+        with engine.connect() as conn:
+            conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(EXPLAIN_LOCK_TIMEOUT_MS)}")
+            rows = run(conn).fetchall()
+        return "\n".join(row[0] for row in rows)
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+
+
+def _check_slow(name, seconds, con, sql, params):
+    if seconds * 1000 < SLOW_QUERY_MS:
+        return
+    plan = _explain(con, sql, params)
+    sql_text = sql if isinstance(sql, str) else getattr(sql, "text", str(sql))
+    _slow.append({
+        "at": datetime.now(),
+        "query": name,
+        "ms": round(seconds * 1000, 1),
+        "sql": " ".join(sql_text.split()),
+        "plan": plan,
+    })
+    logger.warning("Slow query %s took %.0f ms\n%s", name, seconds * 1000, plan)
+
+
+def read_sql(name, sql, con, params=None, **kwargs):
+    """``pd.read_sql`` recorded under ``name``."""
+    start = time.perf_counter()
+    try:
+        df = pd.read_sql(sql, con, params=params, **kwargs)
+    except Exception:
+        _record(name, time.perf_counter() - start, error=True)
+        raise
+    seconds = time.perf_counter() - start
+    _record(name, seconds, len(df))
+    _check_slow(name, seconds, con, sql, params)
+    return df
+
+
+def execute(name, conn, statement, params=None):
+    """``conn.execute`` recorded under ``name``; returns the Result."""
+    start = time.perf_counter()
+    try:
+        result = conn.execute(statement, params) if params is not None else conn.execute(statement)
+    except Exception:
+        _record(name, time.perf_counter() - start, error=True)
+        raise
+    seconds = time.perf_counter() - start
+    _record(name, seconds, result.rowcount)
+    if isinstance(params, dict) or params is None:
+        _check_slow(name, seconds, conn, statement, params)
+    return result
+
+
+def cached_query(name, **cache_kwargs):
+    """``st.cache_data(**cache_kwargs)`` that also counts hits and misses under ``name``.
+
+    The cached function still exposes ``.clear()``.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _local.cache_miss = True  # only runs when the cache has no entry
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(compute)
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            _local.cache_miss = False
+            result = cached(*args, **kwargs)
+            record_cache(name, hit=not _local.cache_miss)
+            return result
+
+        lookup.clear = cached.clear
+        return lookup
+    return decorate
+
+
+def query_stats():
+    """One row per query name, slowest (by total time) first."""
+    with _lock:
+        rows = [{
+            "query": name,
+            "calls": s.count,
+            "errors": s.errors,
+            "rows": s.rows,
+            "avg_ms": round(1000 * s.seconds_total / s.count, 1) if s.count else None,
+            "max_ms": round(1000 * s.seconds_max, 1),
+            "total_ms": round(1000 * s.seconds_total, 1),
+            "cache_hits": s.cache_hits,
+            "cache_misses": s.cache_misses,
+        } for name, s in _stats.items()]
+    return pd.DataFrame(rows).sort_values("total_ms", ascending=False) if rows else pd.DataFrame()
+
+
+def slow_queries():
+    """Most recent slow queries, newest first."""
+    return list(reversed(_slow))
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP portal_query_duration_seconds Query latency by query name.",
+        "# TYPE portal_query_duration_seconds histogram",
+    ]
+    with _lock:
+        snapshot = {name: (s.count, s.seconds_total, list(s.buckets), s.rows, s.errors, s.cache_hits, s.cache_misses)
+                    for name, s in _stats.items()}
+    for name, (count, total, buckets, *_rest) in snapshot.items():
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(f'portal_query_duration_seconds_bucket{{query="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'portal_query_duration_seconds_bucket{{query="{name}",le="+Inf"}} {count}')
+        lines.append(f'portal_query_duration_seconds_sum{{query="{name}"}} {total:.6f}')
+        lines.append(f'portal_query_duration_seconds_count{{query="{name}"}} {count}')
+
+    lines += ["# HELP portal_query_rows_total Rows returned or affected.", "# TYPE portal_query_rows_total counter"]
+    lines += [f'portal_query_rows_total{{query="{n}"}} {v[3]}' for n, v in snapshot.items()]
+    lines += ["# HELP portal_query_errors_total Failed executions.", "# TYPE portal_query_errors_total counter"]
+    lines += [f'portal_query_errors_total{{query="{n}"}} {v[4]}' for n, v in snapshot.items()]
+    lines += ["# HELP portal_cache_requests_total Cached loader lookups.", "# TYPE portal_cache_requests_total counter"]
+    for n, v in snapshot.items():
+        if v[5] or v[6]:
+            lines.append(f'portal_cache_requests_total{{query="{n}",result="hit"}} {v[5]}')
+            lines.append(f'portal_cache_requests_total{{query="{n}",result="miss"}} {v[6]}')
+
+    pool = pool_stats()
+    if "pool_size" in pool:
+        lines += ["# HELP portal_db_pool Connection pool state.", "# TYPE portal_db_pool gauge"]
+        for key in ("pool_size", "checked_out", "idle", "overflow"):
+            lines.append(f'portal_db_pool{{state="{key}"}} {pool[key]}')
+    lines += [
+            "# TYPE portal_db_pool_checkouts_total counter",
+            f"portal_db_pool_checkouts_total {pool['checkouts']}",
+            "# TYPE portal_db_pool_timeouts_total counter",
+            f"portal_db_pool_timeouts_total {pool['timeouts']}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scraped every few seconds; keep the app log quiet
+
+
+_server = None
+_server_attempted = False
+
+
+def start_metrics_server():
+    """Serve ``/metrics`` on ``METRICS_PORT`` in a daemon thread (once per process).
+    Does nothing when the setting is absent."""
+    global _server, _server_attempted
+    with _lock:
+        if _server_attempted:
+            return _server
+        _server_attempted = True
+        port = get_setting("METRICS_PORT", cast=int)
+        if not port:
+            return None
+        try:
+            _server = ThreadingHTTPServer((get_setting("METRICS_HOST", "127.0.0.1"), port), _MetricsHandler)
+        except OSError as e:
+            logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+            return None
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
@@ -0,0 +1,119 @@
+"""Transparency Ranking snapshots in ``dwh.lga_ranking_snapshot``.
+
+A snapshot is 17 rows (one per LGA) derived from the incrementally maintained
+``dwh.fact_abia_metrics`` rows, so taking one costs a scan of 17 rows rather than of
+every submission. ``set_submission_status`` takes one in the same transaction as each
+approve/reject; ``python -m portal.ranking`` takes one on demand (e.g. from cron, so
+new-but-unreviewed submissions show up in the verification rate). Snapshots are never overwritten: the page reads
+the newest one and older ones form the trend history. Each new snapshot thins history
+older than ``RANKING_DETAIL_DAYS`` (default 30) to the last snapshot of each day.
+"""
+from sqlalchemy import text
+
+from portal.config import get_setting
+from portal.dataversion import bump_data_version
+from portal.facilities import FACILITY_KEYS, count_column
+from portal.querylog import cached_query, execute, read_sql
+
+HISTORY_SNAPSHOTS = 60
+RANKING_DETAIL_DAYS = get_setting("RANKING_DETAIL_DAYS", 30, cast=int)
+
+_COUNT_COLUMNS = ", ".join(count_column(key) for key in FACILITY_KEYS)
+_COUNT_VALUES = ", ".join(f"COALESCE(f.{count_column(key)}, 0)" for key in FACILITY_KEYS)
+
+_SNAPSHOT_SQL = text(f"""
+    WITH snap AS (SELECT nextval('dwh.lga_ranking_snapshot_seq') AS snapshot_id)
+    INSERT INTO dwh.lga_ranking_snapshot
+        (snapshot_id, taken_at, lga_key, lga_name, rank, verified_schools, total_submissions,
+         enrollment_total, teachers_total, {_COUNT_COLUMNS})
+    SELECT snap.snapshot_id, NOW(), l.lga_key, l.lga_name,
+           ROW_NUMBER() OVER (
+               ORDER BY COALESCE(f.school_count, 0) DESC,
+                        COALESCE(f.school_count, 0)::NUMERIC / NULLIF(f.submission_count, 0) DESC NULLS LAST,
+                        l.lga_name
+           ),
+           COALESCE(f.school_count, 0), COALESCE(f.submission_count, 0),
+           COALESCE(f.enrollment_total, 0), COALESCE(f.teachers_total, 0), {_COUNT_VALUES}
+    FROM dwh.dim_lga l
+    LEFT JOIN dwh.fact_abia_metrics f ON f.lga_key = l.lga_key
+    CROSS JOIN snap
+    RETURNING snapshot_id
+""")
+
+# Beyond the detail window keep only the last snapshot of each day
+_PRUNE_SQL = text("""
+    WITH old AS (
+        SELECT snapshot_id, taken_at
+        FROM dwh.lga_ranking_snapshot
+        WHERE taken_at < NOW() - make_interval(days => CAST(:days AS INTEGER))
+    ),
+    keep AS (
+        SELECT MAX(snapshot_id) AS snapshot_id FROM old GROUP BY taken_at::date
+    )
+    DELETE FROM dwh.lga_ranking_snapshot
+    WHERE snapshot_id IN (SELECT snapshot_id FROM old EXCEPT SELECT snapshot_id FROM keep)
+""")
+
+# Newest snapshot, shaped for the Transparency Ranking table
+_LATEST_SQL = """
+    SELECT rank,
+           lga_name,
+           verified_schools,
+           total_submissions,
+           ROUND(100.0 * verified_schools / NULLIF(total_submissions, 0), 1) AS verification_rate_percent,
+           boys_toilet_count AS schools_with_boys_toilet,
+           girls_toilet_count AS schools_with_girls_toilet,
+           water_count AS schools_with_water,
+           ROUND(100.0 * boys_toilet_count / NULLIF(verified_schools, 0), 1) AS boys_toilet_pct,
+           ROUND(100.0 * girls_toilet_count / NULLIF(verified_schools, 0), 1) AS girls_toilet_pct,
+           ROUND(100.0 * water_count / NULLIF(verified_schools, 0), 1) AS water_pct,
+           taken_at
+    FROM dwh.lga_ranking_snapshot
+    WHERE snapshot_id = (SELECT MAX(snapshot_id) FROM dwh.lga_ranking_snapshot)
+    ORDER BY rank
+"""
+
+_HISTORY_SQL = text("""
+    SELECT taken_at, lga_name, rank, verified_schools, total_submissions
+    FROM dwh.lga_ranking_snapshot
+    WHERE snapshot_id >= (
+        SELECT COALESCE(MIN(snapshot_id), 0) FROM (
+            SELECT DISTINCT snapshot_id FROM dwh.lga_ranking_snapshot
+            ORDER BY snapshot_id DESC LIMIT :snapshots
+        ) recent
+    )
+    ORDER BY taken_at, rank
+""")
+
+
+def refresh_ranking_snapshot(conn):
+    """Append a snapshot of the current fact rows inside ``conn``'s transaction and
+    thin out history older than ``RANKING_DETAIL_DAYS``."""
+    snapshot_id = execute("ranking.snapshot", conn, _SNAPSHOT_SQL).scalars().first()
+    execute("ranking.prune", conn, _PRUNE_SQL, {"days": RANKING_DETAIL_DAYS})
+    return snapshot_id
+
+
+def read_latest_ranking(engine):
+    """The newest snapshot (17 rows), uncached."""
+    return read_sql("ranking.latest", _LATEST_SQL, engine)
+
+
+@cached_query("ranking.latest", max_entries=4, show_spinner=False)
+def latest_ranking(_engine, version):
+    """``read_latest_ranking`` cached per published-data ``version``."""
+    return read_latest_ranking(_engine)
+
+
+@cached_query("ranking.history", max_entries=4, show_spinner=False)
+def ranking_history(_engine, version, snapshots=HISTORY_SNAPSHOTS):
+    return read_sql("ranking.history", _HISTORY_SQL, _engine, params={"snapshots": snapshots})
+
+
+if __name__ == "__main__":
+    from portal.db import get_engine
+
+    with get_engine().begin() as conn:
+        snapshot_id = refresh_ranking_snapshot(conn)
+        bump_data_version(conn)
+    print(f"Ranking snapshot {snapshot_id} taken.")
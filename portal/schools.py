@@ -0,0 +1,77 @@
+"""One ``schools`` row per school, with a pointer to its current published record.
+
+A school is identified by its LGA plus its normalized name (``name_key_sql``), so
+"Community Sec. School  Ohafia" submitted twice lands on the same school. Every
+submission stays in ``school_submissions`` with a ``school_id`` (the history);
+``schools.current_submission_id`` points at the school's newest approved
+submission (by ``submitted_at, id``). Aggregates, KPIs, the ranking and School
+Lookup read only current records, so a school that resubmits every term is
+counted once. ``set_submission_status`` (portal/aggregates.py) moves the pointer
+and applies the difference between the old and the new current record.
+"""
+from sqlalchemy import text
+
+from portal.querylog import execute
+
+
+def name_key_sql(expr):
+    """SQL expression normalizing a school name: trimmed, lower case, single spaces."""
+    return f"lower(regexp_replace(btrim({expr}), '\\s+', ' ', 'g'))"
+
+
+def is_current_sql(alias="school_submissions"):
+    """SQL predicate: submission ``alias`` is its school's current record (uses
+    the unique index on ``schools.current_submission_id``)."""
+    return f"EXISTS (SELECT 1 FROM schools sc WHERE sc.current_submission_id = {alias}.id)"
+
+
+# Newest approved submission of a school
+LATEST_APPROVED_SQL = """
+    SELECT s.id FROM school_submissions s
+    WHERE s.school_id = {school} AND s.approved = TRUE
+    ORDER BY s.submitted_at DESC, s.id DESC
+    LIMIT 1
+"""
+
+_LINK_SCHOOLS_SQL = text(f"""
+    INSERT INTO schools (lga_key, name_key, school_name, created_at)
+    SELECT DISTINCT ON (lga_key, name_key) lga_key, name_key, school_name, submitted_at
+    FROM (
+        SELECT lga_key, {name_key_sql("school_name")} AS name_key, school_name, submitted_at
+        FROM school_submissions
+        WHERE school_id IS NULL AND lga_key IS NOT NULL
+    ) s
+    ORDER BY lga_key, name_key, submitted_at
+    ON CONFLICT (lga_key, name_key) DO NOTHING
+""")
+
+_LINK_SUBMISSIONS_SQL = text(f"""
+    UPDATE school_submissions s
+    SET school_id = sc.id
+    FROM schools sc
+    WHERE s.school_id IS NULL
+      AND sc.lga_key = s.lga_key
+      AND sc.name_key = {name_key_sql("s.school_name")}
+""")
+
+_REPOINT_ALL_SQL = text(f"""
+    UPDATE schools sc
+    SET current_submission_id = c.id, updated_at = NOW()
+    FROM (
+        SELECT sc2.id AS school_id, ({LATEST_APPROVED_SQL.format(school="sc2.id")}) AS id
+        FROM schools sc2
+    ) c
+    WHERE c.school_id = sc.id AND sc.current_submission_id IS DISTINCT FROM c.id
+""")
+
+
+def link_submissions(conn):
+    """Create schools for, and attach, submissions without a ``school_id`` (upgrades
+    and bulk loads that bypass the save paths). Returns the number linked."""
+    execute("schools.link_schools", conn, _LINK_SCHOOLS_SQL)
+    return execute("schools.link_submissions", conn, _LINK_SUBMISSIONS_SQL).rowcount
+
+
+def repoint_all_schools(conn):
+    """Recompute every ``current_submission_id`` from the submissions (repairs)."""
+    return execute("schools.repoint_all", conn, _REPOINT_ALL_SQL).rowcount
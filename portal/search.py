@@ -0,0 +1,73 @@
+"""Trigram-indexed keyword search over ``school_submissions``.
+
+``database_setup.py`` enables ``pg_trgm`` and creates GIN ``gin_trgm_ops`` indexes on
+the searchable columns, so both ``ILIKE '%term%'`` and the fuzzy word-similarity
+operator ``<%`` are answered from the index instead of scanning every row. Results
+are ranked by ``word_similarity`` and limited in the database.
+"""
+from sqlalchemy import text
+
+from portal.querylog import read_sql
+from portal.schools import is_current_sql
+
+SCHOOL_FIELDS = ("school_name", "lga_name")
+SUBMISSION_FIELDS = ("school_name", "submitted_by", "email")
+
+SEARCH_LIMIT = 50
+
+DEFAULT_COLUMNS = """
+    id, school_name, lga_name, enrollment_total, teachers_total,
+    submitted_by, email, submitted_at, photo_path, facilities, facilities_mask
+"""
+
+
+def like_pattern(term):
+    """``%term%`` with LIKE wildcards in ``term`` escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def keyword_predicate(fields, alias=""):
+    """Index-friendly SQL predicate matching ``:kw_pattern`` (substring) or ``:kw``
+    (fuzzy word match) against any of ``fields``."""
+    prefix = f"{alias}." if alias else ""
+    parts = []
+    for col in fields:
+        parts.append(f"{prefix}{col} ILIKE :kw_pattern")
+        # pg8000 uses the "format" paramstyle and SQLAlchemy does not double percent
+        # signs in text() for it, so the operator is written pre-escaped
+        parts.append(f":kw <%% {prefix}{col}")
+    return "(" + " OR ".join(parts) + ")"
+
+
+def keyword_params(term):
+    term = term.strip()
+    return {"kw": term, "kw_pattern": like_pattern(term)}
+
+
+def rank_expression(fields, alias=""):
+    prefix = f"{alias}." if alias else ""
+    return "GREATEST(" + ", ".join(f"word_similarity(:kw, COALESCE({prefix}{col}, ''))" for col in fields) + ")"
+
+
+def search_submissions(engine, term, fields=SCHOOL_FIELDS, current_only=True,
+                       limit=SEARCH_LIMIT, offset=0, columns=DEFAULT_COLUMNS):
+    """Best matches for ``term`` across ``fields``, most relevant first.
+
+    ``current_only`` limits the hits to each school's current published record.
+    Returns a DataFrame with the requested ``columns`` plus a ``score`` column.
+    """
+    where = [keyword_predicate(fields)]
+    if current_only:
+        where.append("approved = TRUE")
+        where.append(is_current_sql())
+    sql = f"""
+        SELECT {columns}, {rank_expression(fields)} AS score
+        FROM school_submissions
+        WHERE {" AND ".join(where)}
+        ORDER BY score DESC, school_name, id
+        LIMIT :limit OFFSET :offset
+    """
+    params = keyword_params(term)
+    params.update({"limit": limit, "offset": offset})
+    return read_sql("search.submissions", text(sql), engine, params=params)
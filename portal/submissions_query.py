@@ -0,0 +1,125 @@
+"""Filtered, keyset-paginated access to ``school_submissions`` for the Request Data page.
+
+Filters are pushed down into parameterized SQL; pages are fetched with a
+``(submitted_at, id)`` cursor so page N costs the same as page 1, and the total is
+a separate ``COUNT(*)`` over the same predicate.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy import bindparam, text
+
+from portal.querylog import execute, read_sql
+from portal.search import SUBMISSION_FIELDS, keyword_params, keyword_predicate
+
+PAGE_SIZE = 200
+
+STATUS_CONDITIONS = {
+    "Approved": "approved = TRUE",
+    "Rejected": "approved = FALSE",
+    "Pending": "approved IS NULL",
+}
+
+SELECT_COLUMNS = """
+    id, school_name, lga_name, enrollment_total, teachers_total,
+    submitted_by, email, submitted_at,
+    CASE
+        WHEN approved = TRUE THEN 'Approved'
+        WHEN approved = FALSE THEN 'Rejected'
+        ELSE 'Pending'
+    END AS status
+"""
+
+
+@dataclass
+class SubmissionFilter:
+    """Request Data filters. Empty lists / None mean "no restriction"."""
+    lga_keys: list = field(default_factory=list)
+    statuses: list = field(default_factory=list)
+    start_date: date = None
+    end_date: date = None
+    keyword: str = ""
+
+
+def build_where(flt):
+    """Return ``(where_sql, params, expanding_param_names)`` for a filter."""
+    clauses, params, expanding = [], {}, []
+
+    if flt.lga_keys:
+        clauses.append("lga_key IN :lga_keys")
+        params["lga_keys"] = [int(k) for k in flt.lga_keys]
+        expanding.append("lga_keys")
+
+    statuses = [STATUS_CONDITIONS[s] for s in flt.statuses if s in STATUS_CONDITIONS]
+    if statuses and len(statuses) < len(STATUS_CONDITIONS):
+        clauses.append("(" + " OR ".join(statuses) + ")")
+
+    # Half-open range keeps the predicate sargable on submitted_at
+    if flt.start_date:
+        clauses.append("submitted_at >= :start_date")
+        params["start_date"] = flt.start_date
+    if flt.end_date:
+        clauses.append("submitted_at < :end_date")
+        params["end_date"] = flt.end_date + timedelta(days=1)
+
+    keyword = (flt.keyword or "").strip()
+    if keyword:
+        # Trigram-indexed substring / fuzzy match (see portal/search.py)
+        clauses.append(keyword_predicate(SUBMISSION_FIELDS))
+        params.update(keyword_params(keyword))
+
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    return where, params, expanding
+
+
+def _statement(sql, expanding):
+    return text(sql).bindparams(*[bindparam(name, expanding=True) for name in expanding])
+
+
+def count_submissions(engine, flt):
+    where, params, expanding = build_where(flt)
+    with engine.connect() as conn:
+        statement = _statement(f"SELECT COUNT(*) FROM school_submissions {where}", expanding)
+        return execute("submissions.count", conn, statement, params).scalar()
+
+
+def fetch_page(engine, flt, cursor=None, limit=PAGE_SIZE):
+    """One page, newest first. ``cursor`` is the ``(submitted_at, id)`` of the last row
+    of the previous page (``submitted_at`` is NOT NULL, see database_setup.py).
+    Returns ``(DataFrame, next_cursor or None)``."""
+    where, params, expanding = build_where(flt)
+    if cursor is not None:
+        where += (" AND " if where else "WHERE ") + "(submitted_at, id) < (:cursor_ts, :cursor_id)"
+        params["cursor_ts"], params["cursor_id"] = cursor
+    params["limit"] = limit + 1  # one extra row tells us whether there is a next page
+
+    sql = f"""
+        SELECT {SELECT_COLUMNS}
+        FROM school_submissions
+        {where}
+        ORDER BY submitted_at DESC, id DESC
+        LIMIT :limit
+    """
+    df = read_sql("submissions.page", _statement(sql, expanding), engine, params=params)
+    next_cursor = None
+    if len(df) > limit:
+        df = df.iloc[:limit]
+        last = df.iloc[-1]
+        next_cursor = (last["submitted_at"].to_pydatetime(), int(last["id"]))
+    return df, next_cursor
+
+
+def export_statement(flt):
+    """``(statement, params)`` selecting every matching row, for the streaming export."""
+    where, params, expanding = build_where(flt)
+    sql = f"SELECT {SELECT_COLUMNS} FROM school_submissions {where} ORDER BY submitted_at DESC, id DESC"
+    return _statement(sql, expanding), params
+
+
+def submission_date_bounds(engine):
+    """(first, last) submission date, answered from the submitted_at index."""
+    with engine.connect() as conn:
+        first, last = execute("submissions.date_bounds", conn, text(
+            "SELECT MIN(submitted_at)::date, MAX(submitted_at)::date FROM school_submissions"
+        )).one()
+    return first, last
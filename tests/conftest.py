@@ -0,0 +1,34 @@
+"""Shared fixtures.
+
+Database tests run against the scratch PostgreSQL database named by
+``TEST_DATABASE_URL`` (a ``postgresql+pg8000://`` URL) and are skipped without one.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"test database unreachable: {e}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_conn(pg_engine):
+    """A connection whose work is rolled back afterwards; TEMP tables created on it
+    shadow the real ones of the same name."""
+    with pg_engine.connect() as conn:
+        trans = conn.begin()
+        yield conn
+        trans.rollback()
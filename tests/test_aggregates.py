@@ -0,0 +1,15 @@
+from portal import aggregates
+
+
+def test_new_pending_schools_do_not_snapshot_or_bump(monkeypatch):
+    calls = []
+    monkeypatch.setattr(aggregates, "execute", lambda name, conn, stmt, params=None: calls.append((name, params)))
+    monkeypatch.setattr(aggregates, "refresh_ranking_snapshot", lambda conn: calls.append(("snapshot", None)))
+    monkeypatch.setattr(aggregates, "bump_data_version", lambda conn: calls.append(("bump", None)))
+
+    aggregates.add_submission_counts(object(), {3: 2, None: 1, 5: 0})
+    assert calls == [("aggregates.submission_count", [{"lga_key": 3, "n": 2}])]
+
+    calls.clear()
+    aggregates.add_submission_counts(object(), {})
+    assert calls == []
@@ -0,0 +1,23 @@
+from benchmarks.run import compare, run_all
+
+
+def _ok(engine):
+    return 3
+
+
+def _broken(engine):
+    raise RuntimeError("boom")
+
+
+def test_failing_scenario_is_recorded_and_the_run_continues():
+    scenarios = {"broken": _broken, "ok": _ok}
+    results = run_all(scenarios, None, ["broken", "ok"], repeat=2, warmup=0)
+    assert results["broken"] == {"error": "RuntimeError: boom"}
+    assert results["ok"]["runs"] == 2 and results["ok"]["result"] == 3
+
+
+def test_compare_skips_failed_scenarios():
+    ok = {"median_ms": 10.0}
+    results = {"environment": {"submissions": 1}, "scenarios": {"a": {"error": "x"}, "b": {"median_ms": 20.0}}}
+    baseline = {"environment": {"submissions": 1}, "scenarios": {"a": ok, "b": {"error": "y"}}}
+    assert compare(results, baseline, 0.2) == []
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+
+from portal import blobstore
+from portal.blobstore import LocalBlobStore, S3BlobStore, make_key, put_blob, read_blob
+
+JPEG = b"\xff\xd8\xff\xe0" + b"photo" * 100
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blobstore, "_store", store)
+    return store
+
+
+def test_key_is_content_hash_and_extension():
+    assert make_key(JPEG, ".JPG") == hashlib.sha256(JPEG).hexdigest() + ".jpg"
+
+
+def test_local_put_then_get(local_store):
+    key = local_store.put(JPEG, "jpg")
+    assert local_store.exists(key)
+    assert local_store.get(key) == JPEG
+    assert os.path.exists(os.path.join(local_store.root, key[:2], key[2:4], key))
+
+
+def test_local_same_bytes_are_stored_once(local_store):
+    first = local_store.put(JPEG, "jpg")
+    path = local_store._path(first)
+    mtime = os.stat(path).st_mtime_ns
+    assert local_store.put(JPEG, "jpg") == first
+    assert os.stat(path).st_mtime_ns == mtime
+    assert local_store.put(JPEG + b"x", "jpg") != first
+    assert len(os.listdir(os.path.dirname(path))) == 1
+    assert not [name for _, _, files in os.walk(local_store.root) for name in files if name.endswith(".tmp")]
+
+
+def test_local_missing_key(local_store):
+    key = make_key(b"never stored", "png")
+    assert not local_store.exists(key)
+    assert local_store.get(key) is None
+
+
+def test_refs_round_trip_and_legacy_paths(local_store, tmp_path):
+    ref = put_blob(JPEG, "jpg")
+    assert ref.startswith("sha256:")
+    assert read_blob(ref) == JPEG
+    assert read_blob("sha256:" + make_key(b"gone", "jpg")) is None
+
+    legacy = tmp_path / "uploads" / "old.jpg"
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"legacy")
+    assert read_blob(str(legacy)) == b"legacy"
+    assert read_blob(str(tmp_path / "uploads" / "missing.jpg")) is None
+    assert read_blob(None) is None
+
+
+def _moto_store():
+    moto = pytest.importorskip("moto")
+    pytest.importorskip("boto3")
+    mock = moto.mock_aws()
+    mock.start()
+    store = S3BlobStore("portal-test", region="us-east-1", access_key="test", secret_key="test", prefix="photos")
+    store.client.create_bucket(Bucket="portal-test")
+    return store, mock.stop
+
+
+def _minio_store():
+    """S3-compatible server such as MinIO, e.g. TEST_S3_ENDPOINT_URL=http://localhost:9000."""
+    endpoint = os.getenv("TEST_S3_ENDPOINT_URL")
+    if not endpoint:
+        pytest.skip("TEST_S3_ENDPOINT_URL is not set")
+    pytest.importorskip("boto3")
+    bucket = os.getenv("TEST_S3_BUCKET", "portal-test")
+    store = S3BlobStore(
+        bucket,
+        endpoint_url=endpoint,
+        region=os.getenv("TEST_S3_REGION", "us-east-1"),
+        access_key=os.getenv("TEST_S3_ACCESS_KEY_ID", "minioadmin"),
+        secret_key=os.getenv("TEST_S3_SECRET_ACCESS_KEY", "minioadmin"),
+        prefix=f"test-{uuid.uuid4().hex}",
+    )
+    try:
+        store.client.head_bucket(Bucket=bucket)
+    except store._client_error:
+        store.client.create_bucket(Bucket=bucket)
+    return store, lambda: None
+
+
+@pytest.fixture(params=["moto", "minio"])
+def s3_store(request):
+    store, stop = _moto_store() if request.param == "moto" else _minio_store()
+    yield store
+    stop()
+
+
+def test_s3_put_get_dedup_and_missing(s3_store):
+    key = s3_store.put(JPEG, "jpg")
+    assert key == make_key(JPEG, "jpg")
+    assert s3_store.exists(key)
+    assert s3_store.get(key) == JPEG
+    assert s3_store.put(JPEG, "jpg") == key
+
+    listed = s3_store.client.list_objects_v2(Bucket=s3_store.bucket, Prefix=s3_store.prefix)
+    assert [o["Key"] for o in listed["Contents"]] == [s3_store._object_key(key)]
+    head = s3_store.client.head_object(Bucket=s3_store.bucket, Key=s3_store._object_key(key))
+    assert head["ContentType"] == "image/jpeg"
+
+    missing = make_key(b"never stored", "png")
+    assert not s3_store.exists(missing)
+    assert s3_store.get(missing) is None
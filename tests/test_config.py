@@ -0,0 +1,54 @@
+import os
+
+import pytest
+import streamlit
+from streamlit import config as st_config
+from streamlit.runtime.secrets import Secrets
+
+from portal import config
+from portal.config import get_setting
+
+_SECRETS = """
+DB_NAME = "from_secrets"
+DB_HOST = "secret-host"
+DB_POOL_SIZE = 7
+
+[EMAIL]
+EMAIL_USER = "portal@example.org"
+"""
+
+
+@pytest.fixture
+def secrets_file(tmp_path, monkeypatch):
+    path = tmp_path / "secrets.toml"
+    path.write_text(_SECRETS, encoding="utf-8")
+    previous = st_config.get_option("secrets.files")
+    st_config.set_option("secrets.files", [str(path)])
+    monkeypatch.setattr(streamlit, "secrets", Secrets())
+    monkeypatch.setattr(config, "_secrets_loaded", False)
+    for name in ("DB_NAME", "DB_HOST", "DB_PASSWORD", "DB_POOL_SIZE", "EMAIL_USER"):
+        monkeypatch.delenv(name, raising=False)
+    yield path
+    st_config.set_option("secrets.files", previous)
+
+
+def test_environment_wins_over_secrets(secrets_file, monkeypatch):
+    monkeypatch.setenv("DB_NAME", "from_env")
+    assert get_setting("DB_NAME") == "from_env"
+    # Loading secrets.toml must not have overwritten the variable for later readers
+    assert get_setting("DB_NAME") == "from_env"
+    assert os.environ["DB_NAME"] == "from_env"
+
+
+def test_secrets_fill_in_what_the_environment_lacks(secrets_file):
+    assert get_setting("DB_HOST") == "secret-host"
+    assert get_setting("DB_POOL_SIZE", 5, cast=int) == 7
+    assert get_setting("EMAIL_USER", section="EMAIL") == "portal@example.org"
+    assert get_setting("DB_PASSWORD", "fallback") == "fallback"
+
+
+def test_bool_cast(monkeypatch):
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    assert get_setting("DB_POOL_PRE_PING", True, cast=bool) is False
+    monkeypatch.setenv("DB_POOL_PRE_PING", "Yes")
+    assert get_setting("DB_POOL_PRE_PING", False, cast=bool) is True
@@ -0,0 +1,67 @@
+import smtplib
+
+import pytest
+
+from portal import mailer
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, server, port, timeout=None):
+        self.sent, self.noop_error, self.send_error = [], None, None
+        FakeSMTP.instances.append(self)
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        if self.noop_error:
+            raise self.noop_error
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        if self.send_error:
+            raise self.send_error
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def session(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(mailer.smtplib, "SMTP_SSL", FakeSMTP)
+    return mailer.SmtpSession()
+
+
+def test_reuses_one_connection(session):
+    session.send("a@example.org", "s", "b")
+    session.send("b@example.org", "s", "b")
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].sent == ["a@example.org", "b@example.org"]
+
+
+def test_idle_connection_dropped_by_server_is_reopened_before_sending(session):
+    session.send("a@example.org", "s", "b")
+    first = FakeSMTP.instances[0]
+    first.noop_error = smtplib.SMTPServerDisconnected("closed")
+    session.last_used -= mailer.NOOP_AFTER_IDLE_SECONDS + 1
+    session.send("b@example.org", "s", "b")
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[1].sent == ["b@example.org"]
+
+
+def test_failed_send_is_not_resent(session):
+    session.send("a@example.org", "s", "b")
+    FakeSMTP.instances[0].send_error = OSError("connection reset after DATA")
+    with pytest.raises(OSError):
+        session.send("b@example.org", "s", "b")
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].sent == ["a@example.org"]
+
+
+def test_stale_claims_respect_max_attempts():
+    assert "AND attempts < :max_attempts" in str(mailer._CLAIM_SQL)
+    assert "attempts >= :max_attempts" in str(mailer._ABANDON_SQL)
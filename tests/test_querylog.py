@@ -0,0 +1,91 @@
+from sqlalchemy import text
+
+from portal import querylog
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, engine, fail=False):
+        self.engine, self.fail, self.statements = engine, fail, []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def exec_driver_sql(self, sql):
+        self.statements.append(sql)
+        return FakeResult([])
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        if self.fail:
+            raise RuntimeError("relation does not exist")
+        return FakeResult([("Seq Scan on school_submissions",)])
+
+
+class FakeEngine:
+    def __init__(self, fail=False):
+        self.fail, self.connections = fail, []
+
+    def connect(self):
+        conn = FakeConnection(self, self.fail)
+        self.connections.append(conn)
+        return conn
+
+
+class CallerConnection:
+    """Stands in for the caller's connection; EXPLAIN must never touch it."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def execute(self, *args, **kwargs):
+        raise AssertionError("EXPLAIN ran inside the caller's transaction")
+
+    exec_driver_sql = execute
+
+
+def test_explain_uses_its_own_connection():
+    engine = FakeEngine()
+    plan = querylog._explain(CallerConnection(engine), text("SELECT 1 WHERE 1 = :x"), {"x": 1})
+    assert plan == "Seq Scan on school_submissions"
+    (conn,) = engine.connections
+    assert conn.statements[0].startswith("SET LOCAL lock_timeout")
+    assert conn.statements[1].startswith("EXPLAIN SELECT 1")
+
+
+def test_explain_errors_are_swallowed(monkeypatch):
+    engine = FakeEngine(fail=True)
+    monkeypatch.setattr(querylog, "SLOW_QUERY_MS", 0)
+    querylog._check_slow("test.slow", 0.5, CallerConnection(engine), text("SELECT 1"), None)
+    entry = querylog.slow_queries()[0]
+    assert entry["query"] == "test.slow"
+    assert entry["plan"].startswith("(EXPLAIN failed")
+
+
+def test_metrics_server_binds_localhost_by_default(monkeypatch):
+    monkeypatch.setattr(querylog, "_server", None)
+    monkeypatch.setattr(querylog, "_server_attempted", False)
+    # Only METRICS_PORT is configured; METRICS_HOST falls back to its default
+    monkeypatch.setattr(querylog, "get_setting", lambda name, default=None, **kw: 9105 if name == "METRICS_PORT" else default)
+    bound = {}
+
+    class Server:
+        def __init__(self, address, handler):
+            bound["address"] = address
+
+        def serve_forever(self):
+            pass
+
+    monkeypatch.setattr(querylog, "ThreadingHTTPServer", Server)
+    querylog.start_metrics_server()
+    assert bound["address"] == ("127.0.0.1", 9105)
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+from pg8000.dbapi import convert_paramstyle
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql.pg8000 import dialect as pg8000_dialect
+
+from portal import lookup, search, submissions_query
+from portal.submissions_query import SubmissionFilter
+
+
+def to_pg8000(statement, params):
+    """Compile ``statement`` for pg8000 and convert it the way pg8000 does before sending."""
+    compiled = statement.compile(dialect=pg8000_dialect())
+    args = tuple(params[name] for name in compiled.positiontup)
+    return convert_paramstyle("format", str(compiled), args)
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    calls = []
+
+    def fake_read_sql(name, sql, con, params=None, **kwargs):
+        calls.append((sql, params))
+        return pd.DataFrame()
+
+    monkeypatch.setattr(search, "read_sql", fake_read_sql)
+    monkeypatch.setattr(submissions_query, "read_sql", fake_read_sql)
+    return calls
+
+
+def test_like_pattern_escapes_wildcards():
+    assert search.like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+
+def test_search_submissions_statement_is_valid_for_pg8000(captured):
+    search.search_submissions(None, "umuahia")
+    (statement, params), = captured
+    sql, args = to_pg8000(statement, params)
+    assert "<% " in sql
+    assert "umuahia" in args
+
+
+def test_request_data_keyword_filter_is_valid_for_pg8000(captured):
+    submissions_query.fetch_page(None, SubmissionFilter(keyword="ohafia"))
+    (statement, params), = captured
+    sql, _ = to_pg8000(statement, params)
+    assert "<% " in sql
+
+
+_SCHEMA = """
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE TEMP TABLE school_submissions (
+        id SERIAL PRIMARY KEY,
+        school_name VARCHAR(255) NOT NULL,
+        lga_name VARCHAR(100) NOT NULL,
+        lga_key INTEGER,
+        enrollment_total INTEGER DEFAULT 0,
+        teachers_total INTEGER DEFAULT 0,
+        submitted_by VARCHAR(100),
+        email VARCHAR(100),
+        submitted_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        approved BOOLEAN,
+        facilities JSONB,
+        facilities_mask INTEGER NOT NULL DEFAULT 0,
+        photo_path TEXT,
+        thumb_path TEXT
+    );
+    CREATE TEMP TABLE schools (id SERIAL PRIMARY KEY, current_submission_id INTEGER);
+    INSERT INTO school_submissions (school_name, lga_name, submitted_by, email, approved) VALUES
+        ('Community Secondary School Ohafia', 'Ohafia', 'Ada', 'ada@example.org', TRUE),
+        ('Umuahia Girls High School', 'Umuahia North', 'Obi', 'obi@example.org', TRUE),
+        ('Aba Boys Primary School', 'Aba South', 'Eze', 'eze@example.org', NULL);
+    INSERT INTO schools (current_submission_id) SELECT id FROM school_submissions WHERE approved;
+"""
+
+
+@pytest.fixture
+def submissions(pg_conn):
+    for statement in _SCHEMA.split(";"):
+        if statement.strip():
+            pg_conn.execute(text(statement))
+    return pg_conn
+
+
+def test_keyword_search_runs_on_pg8000(submissions):
+    df = search.search_submissions(submissions, "umuahia")
+    assert df["school_name"].tolist() == ["Umuahia Girls High School"]
+
+    fuzzy = search.search_submissions(submissions, "ohafa")
+    assert "Community Secondary School Ohafia" in fuzzy["school_name"].tolist()
+
+
+def test_school_lookup_search_runs_on_pg8000(submissions):
+    df, has_next = lookup.search_page(submissions, "school")
+    assert len(df) == 2 and not has_next
+
+
+def test_request_data_keyword_runs_on_pg8000(submissions):
+    df, cursor = submissions_query.fetch_page(submissions, SubmissionFilter(keyword="aba boys"))
+    assert df["school_name"].tolist() == ["Aba Boys Primary School"]
+    assert cursor is None
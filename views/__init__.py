@@ -0,0 +1,30 @@
+"""Portal pages, one module per sidebar entry.
+
+``app.py`` only draws the shared chrome (page config, CSS, sidebar menu) and then
+calls ``render_page``, which imports the selected page's module on first use.
+Imported modules stay loaded across reruns, so each worker pays for a page's code
+and libraries (plotly for the charts, Pillow for photo uploads, ...) only once,
+and only if someone opens that page.
+"""
+import importlib
+
+PAGES = {
+    "Home": "views.home",
+    "Live Dashboard": "views.dashboard",
+    "Login / Register": "views.account",
+    "Submit Data": "views.submit",
+    "Request Data": "views.request_data",
+    "School Lookup": "views.lookup",
+    "Transparency Ranking": "views.ranking",
+    "User Management": "views.users",
+    "Admin Login": "views.admin_login",
+    "Admin Panel": "views.admin",
+    "About": "views.about",
+}
+
+
+def render_page(name, engine):
+    """Import the page module for ``name`` (if any) and render it."""
+    module = PAGES.get(name)
+    if module is not None:
+        importlib.import_module(module).render(engine)
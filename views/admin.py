@@ -0,0 +1,333 @@
+"""Admin Panel: review queue, bulk approve/reject, operational metrics and the audit log."""
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+
+from portal import db
+from portal.aggregates import set_submission_status
+from portal.audit import AuditFilter, fetch_log_page, list_admins, log_actions, log_export_statement
+from portal.bulk_import import ImportFileError, import_file, import_template
+from portal.cache import invalidate_published_data
+from portal.export import export_query
+from portal.facilities import FACILITY_KEYS, checklist_for_mask, decode_frame
+from portal.mailer import enqueue_many, outbox_stats
+from portal.querylog import execute, query_stats, read_sql, render_prometheus, slow_queries
+from views.common import load_photo
+
+
+def render(engine):
+
+    # -------- SECURITY CHECK --------
+    if not st.session_state.get("admin", False):
+        st.error("Unauthorized access. Redirecting to Home...")
+        st.session_state.selected = "Home"
+        st.rerun()
+
+    st.markdown("# ADMIN PANEL • Full Control")
+    st.success("Logged in as Administrator")
+
+    # Determine admin identifier for logs (prefer session user/email if present)
+    admin_identifier = st.session_state.get("admin_user") \
+                       or (st.session_state.get("user") or {}).get("email") \
+                       or (st.session_state.get("user") or {}).get("full_name") \
+                       or "admin"
+
+    # Logout area (clears admin & returns home)
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if st.button("Logout", type="primary", use_container_width=True):
+            st.session_state.admin = False
+            # clear user session safely
+            if "user" in st.session_state:
+                st.session_state.pop("user", None)
+            st.session_state.selected = "Home"
+            st.experimental_rerun()
+
+    # -------- DB CHECK & LOAD ONE PAGE OF PENDING SUBMISSIONS --------
+    if not engine:
+        st.error("Database not connected.")
+        st.stop()
+
+    REVIEW_PAGE_SIZE = 25
+    if "review_page" not in st.session_state:
+        st.session_state.review_page = 0
+
+    try:
+        with engine.connect() as conn:
+            pending_total = execute("review.pending_count", conn, text("SELECT COUNT(*) FROM school_submissions WHERE approved IS NULL")).scalar()
+        last_page = max((pending_total - 1) // REVIEW_PAGE_SIZE, 0)
+        st.session_state.review_page = min(st.session_state.review_page, last_page)
+
+        pending = read_sql("review.pending_page", text("""
+            SELECT id, school_name, lga_name, enrollment_total, teachers_total,
+                   submitted_by, email, submitted_at, facilities, facilities_mask, photo_path, thumb_path,
+                   (SELECT sc.current_submission_id FROM schools sc
+                    WHERE sc.id = school_submissions.school_id) AS current_submission_id
+            FROM school_submissions
+            WHERE approved IS NULL
+            ORDER BY submitted_at DESC, id DESC
+            LIMIT :limit OFFSET :offset
+        """), con=engine, params={"limit": REVIEW_PAGE_SIZE, "offset": st.session_state.review_page * REVIEW_PAGE_SIZE})
+        pending = decode_frame(pending)  # facilities decoded once, not per rendered row
+    except Exception as e:
+        st.error(f"Failed to load pending submissions: {e}")
+        st.stop()
+
+    # -------- Review action: one transaction for any number of submissions --------
+    def review_submissions(submission_ids: list, approve: bool):
+        """Approve/reject in one set-based statement, update the LGA aggregates, queue
+        the notification emails and write the audit entries in the same transaction,
+        then refresh caches once."""
+        with engine.begin() as conn:
+            changed = set_submission_status(conn, submission_ids, approve)
+            log_actions(conn, admin_identifier, "APPROVED" if approve else "REJECTED", changed)
+            if approve:
+                messages = [(sub["email"], "APPROVED – Abia Education Portal",
+                             f"Good news!\n\nYour submission for **{sub['school_name'] or '(Unknown)'}** has been APPROVED and is now live.\n\nThank you!\n— Abia Education Portal Team")
+                            for sub in changed]
+            else:
+                messages = [(sub["email"], "Submission Rejected – Abia Education Portal",
+                             f"Hello,\n\nYour submission for **{sub['school_name'] or '(Unknown)'}** was reviewed but could not be approved.\n\nPlease resubmit with correct details and photo.\n\n— Abia Education Portal Team")
+                            for sub in changed]
+            enqueue_many(messages, conn=conn)
+
+        invalidate_published_data()
+        return changed
+
+    # -------- UI: Pending queue (paginated) --------
+    st.subheader(f"Pending Submissions ({pending_total:,})")
+    if pending.empty:
+        st.info("No pending submissions at this time.")
+    else:
+        # ---- Bulk review: tick rows, then approve/reject them together ----
+        queue = pending[["id", "school_name", "lga_name", "enrollment_total", "teachers_total",
+                         "submitted_by", "submitted_at"]].copy()
+        queue["facilities"] = pending["badges"].map(", ".join)
+        select_all = st.checkbox("Select all on this page", key=f"review_select_all_{st.session_state.review_page}")
+        queue.insert(0, "select", select_all)
+        edited = st.data_editor(
+            queue,
+            hide_index=True,
+            use_container_width=True,
+            disabled=[c for c in queue.columns if c != "select"],
+            column_config={"select": st.column_config.CheckboxColumn("Select")},
+            key=f"review_queue_{st.session_state.review_page}_{select_all}",
+        )
+        selected_ids = edited.loc[edited["select"], "id"].astype(int).tolist()
+
+        b1, b2, b3 = st.columns([1, 1, 2])
+        with b1:
+            bulk_approve = st.button(f"APPROVE Selected ({len(selected_ids)})", type="primary",
+                                     disabled=not selected_ids, use_container_width=True)
+        with b2:
+            bulk_reject = st.button(f"REJECT Selected ({len(selected_ids)})", type="secondary",
+                                    disabled=not selected_ids, use_container_width=True)
+        if bulk_approve or bulk_reject:
+            try:
+                changed = review_submissions(selected_ids, approve=bool(bulk_approve))
+                st.success(f"{len(changed)} submission(s) {'approved' if bulk_approve else 'rejected'}")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Bulk review failed: {e}")
+
+        with b3:
+            p1, p2, p3 = st.columns([1, 2, 1])
+            with p1:
+                if st.button("←", disabled=st.session_state.review_page == 0, key="review_prev"):
+                    st.session_state.review_page -= 1
+                    st.rerun()
+            with p2:
+                st.caption(f"Page {st.session_state.review_page + 1} of {last_page + 1}")
+            with p3:
+                if st.button("→", disabled=st.session_state.review_page >= last_page, key="review_next"):
+                    st.session_state.review_page += 1
+                    st.rerun()
+
+        st.markdown("#### Review Details")
+        # Iterate over this page's rows and show expanders
+        for _, row in pending.iterrows():
+            sub_id = int(row["id"])
+            submitted_at_str = ""
+            try:
+                submitted_at_str = pd.to_datetime(row["submitted_at"]).strftime("%b %d, %Y %H:%M")
+            except Exception:
+                submitted_at_str = str(row["submitted_at"])
+
+            with st.expander(f"#{sub_id} — {row.get('school_name','(Unknown)')} • {row.get('lga_name','(Unknown)')} • Submitted {submitted_at_str}"):
+                left, right = st.columns([1, 2])
+
+                # --- Left: Photo and basic info ---
+                with left:
+                    st.markdown(f"**Students:** {int(row.get('enrollment_total') or 0):,}")
+                    st.markdown(f"**Teachers:** {int(row.get('teachers_total') or 0):,}")
+                    st.markdown(f"**Contact:** {row.get('submitted_by') or 'N/A'}")
+                    st.markdown(f"**Email:** {row.get('email') or 'N/A'}")
+                    if pd.notna(row.get("current_submission_id")):
+                        # Resubmission: approving it replaces the school's published record
+                        st.caption(f"Replaces published record #{int(row['current_submission_id'])} if approved")
+                    thumb = load_photo(row.get("thumb_path"))
+                    full_photo = None
+                    if not thumb or st.checkbox("Show full photo", key=f"full_photo_{sub_id}"):
+                        # Thumbnail by default; the full (downsized) proof only on request
+                        full_photo = load_photo(row.get("photo_path"))
+                    if full_photo or thumb:
+                        try:
+                            st.image(full_photo or thumb, caption="Photo proof", use_column_width=True)
+                        except Exception:
+                            st.warning("Photo exists but could not be displayed.")
+                    else:
+                        st.info("Photo missing or path invalid.")  # info instead of warning to reduce alarm
+
+                # --- Right: Facilities and actions ---
+                with right:
+                    st.markdown("#### Functional Facilities")
+                    cols = st.columns(4)
+                    for i, (short_label, working) in enumerate(checklist_for_mask(row["facility_mask"])):
+                        with cols[i % 4]:
+                            if working:
+                                st.success(f"{short_label}: Yes")
+                            else:
+                                st.info(f"{short_label}: No")
+
+                    st.markdown("---")
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        if st.button("APPROVE & Publish", key=f"approve_{sub_id}", type="primary", use_container_width=True):
+                            try:
+                                review_submissions([sub_id], approve=True)
+                                st.success("APPROVED & LIVE!")
+                                st.balloons()
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Failed to approve submission: {e}")
+
+                    with c2:
+                        if st.button("REJECT", key=f"reject_{sub_id}", type="secondary", use_container_width=True):
+                            try:
+                                review_submissions([sub_id], approve=False)
+                                st.warning("Rejected")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Failed to reject submission: {e}")
+
+    # -------- Bulk import of census spreadsheets (portal/bulk_import.py) --------
+    with st.expander("Bulk Import (CSV / Excel)"):
+        st.caption("Required columns: school_name, lga, students, teachers. Optional: submitted_by, email, "
+                   "facilities (labels separated by ;) or one yes/no column per facility "
+                   f"({', '.join(FACILITY_KEYS)}). Valid rows are imported; the rest are listed below.")
+        st.download_button("Download template (CSV)", data=import_template(),
+                           file_name="census_import_template.csv", mime="text/csv")
+        upload = st.file_uploader("Census file", type=["csv", "xlsx"], key="import_file")
+        publish = st.checkbox("Approve imported rows immediately", key="import_approve")
+        b1, b2 = st.columns(2)
+        with b1:
+            check_btn = st.button("Validate only", key="import_check", disabled=upload is None, use_container_width=True)
+        with b2:
+            import_btn = st.button("Import", key="import_run", type="primary", disabled=upload is None,
+                                   use_container_width=True)
+        if upload is not None and (check_btn or import_btn):
+            try:
+                upload.seek(0)
+                with st.spinner("Importing..." if import_btn else "Validating..."):
+                    result = import_file(engine, upload.name, upload, admin_identifier,
+                                         approve=publish, dry_run=not import_btn)
+                if import_btn:
+                    if result.rows_imported:
+                        invalidate_published_data()
+                    st.success(f"Imported {result.rows_imported:,} of {result.rows_read:,} rows"
+                               + f" ({result.new_schools:,} new schools"
+                               + (f", {result.approved:,} approved)" if publish else ")")
+                               + f" in {result.seconds:.1f}s")
+                else:
+                    st.info(f"{result.rows_valid:,} of {result.rows_read:,} rows are valid ({result.seconds:.1f}s)")
+                if result.errors:
+                    report = result.error_report()
+                    st.warning(f"{result.rows_rejected:,} rows rejected")
+                    st.dataframe(report.head(500), hide_index=True, use_container_width=True)
+                    st.download_button("Download error report", report.to_csv(index=False),
+                                       file_name="import_errors.csv", mime="text/csv")
+            except ImportFileError as e:
+                st.error(str(e))
+            except Exception as e:
+                st.error(f"Import failed, nothing was saved: {e}")
+
+    # -------- Connection pool health --------
+    with st.expander("Database Connection Pool"):
+        stats = db.pool_stats()
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: st.metric("In Use", stats.get("checked_out", 0))
+        with c2: st.metric("Idle", stats.get("idle", 0))
+        with c3: st.metric("Avg Wait (ms)", stats["wait_ms_avg"])
+        with c4: st.metric("Timeouts", stats["timeouts"])
+        st.json(stats)
+
+    # -------- Per-query latency / cache metrics (this worker process) --------
+    with st.expander("Query Metrics"):
+        metrics = query_stats()
+        if metrics.empty:
+            st.info("No queries recorded yet.")
+        else:
+            st.dataframe(metrics, hide_index=True, use_container_width=True)
+        slow = slow_queries()
+        st.markdown(f"**Slow queries** (latest {len(slow)})")
+        for entry in slow:
+            st.markdown(f"`{entry['query']}` • {entry['ms']:,.0f} ms • {entry['at']:%d %b %H:%M:%S}")
+            st.code(entry["sql"] + "\n\n" + entry["plan"], language="sql")
+        st.download_button("Download Prometheus metrics", render_prometheus(),
+                           file_name="portal_metrics.txt", mime="text/plain")
+
+    # -------- Outbound email queue --------
+    with st.expander("Email Outbox"):
+        try:
+            counts = outbox_stats(engine)
+            c1, c2, c3, c4 = st.columns(4)
+            with c1: st.metric("Pending", counts.get("pending", 0))
+            with c2: st.metric("Sending", counts.get("sending", 0))
+            with c3: st.metric("Sent", counts.get("sent", 0))
+            with c4: st.metric("Failed", counts.get("failed", 0))
+        except Exception as e:
+            st.warning(f"Could not read email outbox: {e}")
+
+    # -------- Admin activity log (database-backed, one page at a time) --------
+    st.markdown("---")
+    st.markdown("### Admin Activity Log")
+    try:
+        f1, f2 = st.columns(2)
+        with f1:
+            log_range = st.date_input("Date range", value=(), key="audit_range")
+        with f2:
+            admin_choice = st.selectbox("Admin", ["All"] + list_admins(engine), key="audit_admin")
+
+        log_filter = AuditFilter(
+            start_date=log_range[0] if len(log_range) >= 1 else None,
+            end_date=log_range[-1] if len(log_range) >= 1 else None,
+            admin=None if admin_choice == "All" else admin_choice,
+        )
+        if st.session_state.get("audit_filter") != log_filter:
+            st.session_state.audit_filter = log_filter
+            st.session_state.audit_cursors = [None]
+
+        log_df, next_log_cursor = fetch_log_page(engine, log_filter, st.session_state.audit_cursors[-1])
+        if log_df.empty:
+            st.info("No admin actions logged yet.")
+        else:
+            st.dataframe(log_df, use_container_width=True, hide_index=True)
+
+            l1, l2, l3 = st.columns([1, 1, 2])
+            with l1:
+                if st.button("← Newer", disabled=len(st.session_state.audit_cursors) == 1, key="audit_newer"):
+                    st.session_state.audit_cursors.pop()
+                    st.rerun()
+            with l2:
+                if st.button("Older →", disabled=next_log_cursor is None, key="audit_older"):
+                    st.session_state.audit_cursors.append(next_log_cursor)
+                    st.rerun()
+            with l3:
+                # Streamed from the database in chunks (portal/export.py)
+                if st.button("Prepare Log Download (CSV)", key="audit_export"):
+                    statement, params = log_export_statement(log_filter)
+                    log_csv = export_query(engine, statement, params, fmt="csv")  # bytes, as download_button needs
+                    st.download_button("Download Admin Log", data=log_csv,
+                                       file_name="admin_log.csv", mime="text/csv")
+    except Exception as e:
+        st.error(f"Failed to read admin log: {e}")
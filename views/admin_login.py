@@ -0,0 +1,41 @@
+"""Admin Login: password + 2FA form with attempt lockout."""
+import pandas as pd
+import streamlit as st
+
+
+def render(engine):
+    st.markdown("### Secure Admin Access")
+
+    # Login attempt tracking
+    if "login_attempts" not in st.session_state:
+        st.session_state.login_attempts = 0
+    if "lockout_time" not in st.session_state:
+        st.session_state.lockout_time = None
+
+    if st.session_state.lockout_time:
+        if pd.Timestamp.now() < st.session_state.lockout_time:
+            st.error(f"Too many attempts. Try again in {int((st.session_state.lockout_time - pd.Timestamp.now()).total_seconds())} seconds")
+            st.stop()
+        else:
+            st.session_state.login_attempts = 0
+            st.session_state.lockout_time = None
+
+    with st.form("secure_login"):
+        user = st.text_input("Username")
+        pwd = st.text_input("Password", type="password")
+        otp = st.text_input("2FA Code (check your phone/email)")
+
+        if st.form_submit_button("Login"):
+            if user == "admin" and pwd == st.secrets["ADMIN_PASSWORD"] and otp == st.secrets["ADMIN_2FA"]:
+                st.session_state.admin = True
+                st.session_state.login_attempts = 0
+                st.success("Welcome, Administrator!")
+                st.balloons()
+                st.rerun()
+            else:
+                st.session_state.login_attempts += 1
+                if st.session_state.login_attempts >= 5:
+                    st.session_state.lockout_time = pd.Timestamp.now() + pd.Timedelta(minutes=15)
+                    st.error("Account locked for 15 minutes")
+                else:
+                    st.error(f"Access denied ({st.session_state.login_attempts}/5)")
@@ -0,0 +1,42 @@
+"""Helpers shared by several pages."""
+import hashlib
+
+import pandas as pd
+import streamlit as st
+
+from portal import db
+from portal.blobstore import read_blob
+from portal.mailer import enqueue_email
+from portal.querylog import cached_query, read_sql
+
+
+# ===================== PASSWORD HASHING =====================
+def hash_password(password: str) -> str:
+    """Return SHA-256 hash of password as hex string"""
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+# ===================== EMAIL FUNCTION =====================
+# Queues the message in email_outbox; the background sender in portal/mailer.py
+# delivers it over a persistent SMTP connection, so pages never wait on Gmail.
+def send_email(to_email, subject, body):
+    try:
+        enqueue_email(to_email, subject, body)
+        return True
+    except Exception as e:
+        st.error(f"❌ Email Error: {e}")
+        return False
+
+
+# ===================== DATA FUNCTIONS =====================
+@cached_query("lgas.list", ttl=3600)
+def get_lgas():
+    engine = db.get_engine()
+    if not engine: return pd.DataFrame(columns=["lga_key", "lga_name"])
+    return read_sql("lgas.list", "SELECT lga_key, lga_name FROM dwh.dim_lga ORDER BY lga_name", engine)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def load_photo(ref):
+    # Blob references are content hashes (immutable), so caching by reference is safe
+    return read_blob(ref)
@@ -0,0 +1,98 @@
+"""Live Dashboard: LGA rollups, facility gaps and recent activity from one shared snapshot."""
+import plotly.express as px
+import streamlit as st
+
+from portal.dashboard import DASHBOARD_POLL_SECONDS, data_version, get_dashboard_data
+
+
+def render(engine):
+    st.markdown("# Live Education Dashboard • Abia State")
+    st.markdown("**Real-time • Verified • Transparent** • Updates as soon as submissions are approved")
+
+    # ============ SAFELY LOAD DATA ============
+    try:
+        # One snapshot per data version, shared by every open dashboard
+        seen_version = data_version(engine)
+        dashboard = get_dashboard_data(engine, seen_version)
+        df = dashboard["lgas"]
+        total_schools = dashboard["total_schools"]
+        facility_df = dashboard["facilities"]
+        recent = dashboard["recent"]
+    except Exception as e:
+        st.error(f"Database error: {e}")
+        st.stop()
+
+    # ============ CHANGE-DRIVEN REFRESH ============
+    # Only this fragment reruns on the timer; it checks the cached version number and
+    # reruns the full page only when approvals have changed the data
+    @st.fragment(run_every=DASHBOARD_POLL_SECONDS)
+    def watch_data_version():
+        try:
+            changed = data_version(engine) != seen_version
+        except Exception:
+            changed = False  # keep showing the current snapshot; the next poll retries
+        if changed:
+            st.rerun()
+
+    watch_data_version()
+
+    # ============ TOP METRICS ============
+    col1, col2, col3, col4 = st.columns(4)
+    with col1: st.metric("Total Students", f"{int(df['students'].sum()):,}" if df['students'].sum() > 0 else "0")
+    with col2: st.metric("Total Teachers", f"{int(df['teachers'].sum()):,}" if df['teachers'].sum() > 0 else "0")
+    with col3: st.metric("Verified Schools", f"{total_schools:,}")
+    with col4: 
+        avg_ratio = df['ratio'].mean() if not df.empty else 0
+        st.metric("Avg Pupil-Teacher Ratio", f"{avg_ratio:.1f}")
+
+    # ============ CRISIS ALERTS (SAFE) ============
+    if not facility_df.empty and facility_df["total_schools"].sum() > 0:
+        no_toilet_pct = (facility_df["missing_boys_toilet"].sum() / facility_df["total_schools"].sum()) * 100
+        no_water_pct = (facility_df["missing_water"].sum() / facility_df["total_schools"].sum()) * 100
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.error(f"**{no_toilet_pct:.0f}%** of schools have **no boys toilet**")
+        with col2:
+            st.error(f"**{no_water_pct:.0f}%** of schools have **no clean water**")
+    else:
+        st.info("No facility data yet — will appear after first submissions")
+
+    # ============ TOILET CRISIS HEATMAP (100% FIXED) ============
+    st.markdown("### Toilet Crisis Heatmap")
+    if not facility_df.empty and facility_df["total_schools"].sum() > 0:
+        facility_df["Toilet Crisis %"] = (facility_df["missing_boys_toilet"] / facility_df["total_schools"] * 100).round(1)
+        
+        fig = px.treemap(
+            facility_df,
+            path=['lga_name'],
+            values='total_schools',                    # ← CORRECT
+            color='Toilet Crisis %',
+            color_continuous_scale="Reds",
+            title="LGA Toilet Crisis (Darker = More Schools Without Toilets)"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Toilet crisis map will appear when schools submit facility data")
+
+    # ============ STUDENTS & TEACHERS BY LGA ============
+    if not df.empty:
+        col1, col2 = st.columns(2)
+        with col1:
+            fig1 = px.bar(df.sort_values("students", ascending=False), x="lga_name", y="students", color="students", color_continuous_scale="Greens")
+            st.plotly_chart(fig1, use_container_width=True)
+        with col2:
+            fig2 = px.bar(df.sort_values("teachers", ascending=False), x="lga_name", y="teachers", color="teachers", color_continuous_scale="Blues")
+            st.plotly_chart(fig2, use_container_width=True)
+    else:
+        st.info("Charts will appear when schools submit data")
+
+    # ============ RECENT ACTIVITY ============
+    st.markdown("### Recent Submission Activity")
+    if not recent.empty:
+        fig = px.line(recent, x="date", y="count", title="Daily Submissions (Last 7 Days)")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No submissions in the last 7 days")
+
+    st.success("LIVE • VERIFIED • ABIA STATE")
@@ -0,0 +1,155 @@
+"""School Lookup: paginated school cards with trigram search."""
+import pandas as pd
+import streamlit as st
+
+from portal.kpis import get_home_kpis
+from portal.lookup import CARDS_PER_PAGE, browse_page, search_page
+from views.common import load_photo, send_email
+
+
+def render(engine):
+    st.markdown("# School Lookup")
+    st.markdown("### Search any school in Abia State • View verified records • Report issues instantly")
+
+    # Search Bar
+    search = st.text_input(
+        "🔍 Search by school name or LGA",
+        placeholder="e.g. Umuahia High School, Aba North, Ohafia",
+        help="Start typing to filter results"
+    )
+
+    if not engine:
+        st.error("Database not connected.")
+        st.stop()
+
+    # Only one page of cards is fetched per rerun (portal/lookup.py)
+    term = search.strip()
+    if st.session_state.get("lookup_term") != term:
+        st.session_state.lookup_term = term
+        st.session_state.lookup_cursors = [None]   # browse: keyset cursor per page
+        st.session_state.lookup_page = 0           # search: ranked result page
+
+    try:
+        if term:
+            df, has_next = search_page(engine, term, st.session_state.lookup_page)
+            next_cursor = None
+        else:
+            df, next_cursor = browse_page(engine, st.session_state.lookup_cursors[-1])
+            has_next = next_cursor is not None
+    except Exception as e:
+        st.error(f"Failed to load schools: {e}")
+        st.stop()
+
+    page_no = st.session_state.lookup_page if term else len(st.session_state.lookup_cursors) - 1
+
+    if df.empty and page_no == 0:
+        st.info("No verified schools found.")
+        st.stop()
+
+    first = page_no * CARDS_PER_PAGE + 1
+    if term:
+        st.markdown(f"**Showing matches {first:,}–{first + len(df) - 1:,}** • best matches first")
+    else:
+        total = get_home_kpis(engine)["total_schools"]
+        st.markdown(f"**Showing schools {first:,}–{first + len(df) - 1:,} of {total:,}**")
+
+    # Loop results
+    for _, row in df.iterrows():
+        with st.container():
+            col1, col2 = st.columns([1, 3])
+
+            # ========== PHOTO COLUMN ==========
+            with col1:
+                photo = load_photo(row.get("thumb_path") or row.get("photo_path"))  # small thumbnail for cards
+                if photo:
+                    try:
+                        st.image(photo, use_container_width=True)
+                    except:
+                        st.image("https://via.placeholder.com/400x300?text=Image+Error", use_container_width=True)
+                else:
+                    st.image("https://via.placeholder.com/400x300?text=No+Photo", use_container_width=True)
+
+            # ========== INFO COLUMN ==========
+            with col2:
+                st.markdown(f"### {row['school_name']}")
+                st.markdown(f"**LGA:** {row['lga_name']}")
+                st.markdown(f"**Students:** {int(row['enrollment_total']):,}")
+                st.markdown(f"**Teachers:** {int(row['teachers_total']):,}")
+
+                # ----- Facilities (badges precomputed from facilities_mask) -----
+                st.markdown("#### Working Facilities")
+                cols = st.columns(4)
+                for i, short in enumerate(row["badges"]):
+                    with cols[i % 4]:
+                        st.success(short)
+
+                st.markdown("---")
+
+                # ========== REPORT BUTTON ==========
+                report_key = f"report_{row['id']}"
+                if st.button("Report Issue at This School", key=report_key, use_container_width=True):
+
+                    with st.expander(f"Report Issue — {row['school_name']}"):
+                        with st.form(f"report_form_{row['id']}"):
+                            st.warning(f"Reporting a problem for **{row['school_name']}**, {row['lga_name']}")
+
+                            issue = st.selectbox("What’s wrong?", [
+                                "No Toilets", "No Clean Water", "Leaking Roof", "No Teachers",
+                                "No Desks/Chairs", "Illegal Fees", "Security Issue", "Other"
+                            ])
+
+                            details = st.text_area("Describe the issue")
+                            contact = st.text_input("Your phone/email (optional)")
+
+                            c1, c2 = st.columns(2)
+
+                            with c1:
+                                send = st.form_submit_button("Send Report", type="primary")
+
+                            with c2:
+                                cancel = st.form_submit_button("Cancel")
+
+                            if send:
+                                body = f"""
+NEW SCHOOL COMPLAINT
+School: {row['school_name']}
+LGA: {row['lga_name']}
+Issue: {issue}
+Details: {details}
+Contact: {contact or "Anonymous"}
+Time: {pd.Timestamp.now()}
+                                """
+                                try:
+                                    send_email(
+                                        "complaints@abiaeducation.gov.ng",
+                                        f"URGENT: {issue} – {row['school_name']}",
+                                        body
+                                    )
+                                    st.success("Report sent successfully. Thank you!")
+                                    st.balloons()
+                                except Exception as e:
+                                    st.error(f"Failed to send report: {e}")
+
+                            if cancel:
+                                st.rerun()
+
+        st.markdown("---")
+
+    # ========== PAGINATION ==========
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Previous", disabled=page_no == 0, use_container_width=True, key="lookup_prev"):
+            if term:
+                st.session_state.lookup_page -= 1
+            else:
+                st.session_state.lookup_cursors.pop()
+            st.rerun()
+    with info_col:
+        st.caption(f"Page {page_no + 1} • {CARDS_PER_PAGE} schools per page")
+    with next_col:
+        if st.button("Next →", disabled=not has_next, use_container_width=True, key="lookup_next"):
+            if term:
+                st.session_state.lookup_page += 1
+            else:
+                st.session_state.lookup_cursors.append(next_cursor)
+            st.rerun()
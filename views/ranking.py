@@ -0,0 +1,78 @@
+"""Transparency Ranking: newest precomputed LGA snapshot plus rank history."""
+import plotly.express as px
+import streamlit as st
+
+from portal.dashboard import data_version
+from portal.ranking import latest_ranking, ranking_history
+
+
+def render(engine):
+    st.markdown("# LGA Education Transparency Ranking")
+    st.markdown("### Which LGA is leading in verified school data and facilities?")
+
+    if not engine:
+        st.error("Database not connected")
+        st.stop()
+
+    # Newest precomputed snapshot (17 rows), cached per published-data version
+    try:
+        version = data_version(engine)
+        ranking = latest_ranking(engine, version)
+    except Exception as e:
+        st.error(f"Database error: {e}")
+        st.stop()
+
+    if ranking.empty or ranking["verified_schools"].sum() == 0:
+        st.info("No verified data yet.")
+    else:
+        ranking = ranking.set_index("rank")
+        ranking.index.name = "Rank"
+        taken_at = ranking.pop("taken_at").iloc[0]
+
+        # Simple, beautiful formatting WITHOUT matplotlib
+        def highlight_row(row):
+            if row.name == 1:
+                return ['background-color: #d4edda; font-weight: bold'] * len(row)  # Green for #1
+            elif row.name == len(ranking):
+                return ['background-color: #f8d7da; font-weight: bold'] * len(row)  # Red for last
+            else:
+                return [''] * len(row)
+
+        styled = ranking.style\
+            .format({
+                "verification_rate_percent": "{:.1f}%",
+                "boys_toilet_pct": "{:.1f}%",
+                "girls_toilet_pct": "{:.1f}%",
+                "water_pct": "{:.1f}%"
+            }, na_rep="–")\
+            .apply(highlight_row, axis=1)\
+            .set_properties(**{'text-align': 'center'})\
+            .set_table_styles([
+                {'selector': 'th', 'props': [('background-color', '#006400'), ('color', 'white'), ('font-weight', 'bold')]},
+                {'selector': 'td', 'props': [('padding', '12px'), ('border', '1px solid #ddd')]}
+            ])
+
+        st.dataframe(styled, use_container_width=True)
+
+        # Top & Bottom highlight
+        col1, col2 = st.columns(2)
+        with col1:
+            st.success(f"Leading LGA: **{ranking.iloc[0]['lga_name']}** • {ranking.iloc[0]['verified_schools']} schools")
+        with col2:
+            st.error(f"Lagging LGA: **{ranking.iloc[-1]['lga_name']}** • Only {ranking.iloc[-1]['verified_schools']} schools")
+
+        # Trend history from earlier snapshots
+        with st.expander("Ranking history"):
+            history = ranking_history(engine, version)
+            if history["taken_at"].nunique() > 1:
+                fig = px.line(history, x="taken_at", y="rank", color="lga_name", markers=True,
+                              labels={"taken_at": "Snapshot", "rank": "Rank", "lga_name": "LGA"})
+                fig.update_yaxes(autorange="reversed")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("History will appear after the next approvals.")
+
+        st.markdown("---")
+        st.caption(f"Green row = Best performing • Red row = Needs urgent attention • Snapshot taken {taken_at:%d %b %Y %H:%M}")
+        st.caption("Submission totals are as of the snapshot: schools that submitted since then "
+                   "are counted from the next approval or scheduled refresh.")
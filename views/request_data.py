@@ -0,0 +1,140 @@
+"""Request Data: filtered, keyset-paginated preview and streamed dataset export."""
+import pandas as pd
+import streamlit as st
+
+from portal.concurrent import run_concurrently
+from portal.export import FORMATS, export_query
+from portal.submissions_query import (
+    PAGE_SIZE, SubmissionFilter, count_submissions, export_statement, fetch_page, submission_date_bounds,
+)
+from views.common import get_lgas
+
+
+def render(engine):
+    st.markdown("""
+    <div class='card'>
+        <h2>Download Education Dataset</h2>
+        <p>Filter by LGA, approval status, dates, or keywords. Export to Excel in one click.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if not engine:
+        st.error("Database not connected.")
+        st.stop()
+
+    # Only the LGA list and the date bounds are loaded up front; rows are fetched per page
+    try:
+        lga_df = get_lgas()
+        min_date, max_date = submission_date_bounds(engine)
+    except Exception as e:
+        st.error(f"Failed to load data: {e}")
+        st.stop()
+
+    if min_date is None:
+        st.info("No submissions found.")
+        st.stop()
+
+    lga_keys_by_name = dict(zip(lga_df["lga_name"], lga_df["lga_key"]))
+
+    # FILTERS
+    col1, col2 = st.columns(2)
+
+    # ====== LGA + STATUS FILTERS ======
+    with col1:
+        lga_options = ["All"] + list(lga_keys_by_name)
+        lga_filter = st.multiselect("Filter by LGA", lga_options, default="All")
+
+        # Force 'All' to be exclusive
+        if "All" in lga_filter and len(lga_filter) > 1:
+            lga_filter = ["All"]
+
+        status_options = ["All", "Approved", "Pending", "Rejected"]
+        status_filter = st.multiselect("Filter by Status", status_options, default="Approved")
+
+        if "All" in status_filter and len(status_filter) > 1:
+            status_filter = ["All"]
+
+    # ====== DATE RANGE ======
+    with col2:
+        date_range = st.date_input(
+            "Submission Date Range",
+            value=(min_date, max_date)
+        )
+
+        if isinstance(date_range, tuple) and len(date_range) == 2:
+            start_date, end_date = date_range
+        elif isinstance(date_range, tuple):
+            start_date = end_date = date_range[0]
+        else:
+            start_date = end_date = date_range
+
+    # ====== KEYWORD SEARCH ======
+    search = st.text_input("Search school name, submitter, or email", "")
+
+    # ====== BUILD SERVER-SIDE FILTER ======
+    flt = SubmissionFilter(
+        lga_keys=[] if "All" in lga_filter else [lga_keys_by_name[n] for n in lga_filter],
+        statuses=[] if "All" in status_filter else list(status_filter),
+        start_date=start_date,
+        end_date=end_date,
+        keyword=search,
+    )
+
+    # Reset pagination whenever the filters change
+    if st.session_state.get("rd_filter") != flt:
+        st.session_state.rd_filter = flt
+        st.session_state.rd_cursors = [None]
+
+    try:
+        # Count and page are independent; fetch them side by side
+        cursor = st.session_state.rd_cursors[-1]
+        total, (page_df, next_cursor) = run_concurrently(
+            lambda: count_submissions(engine, flt),
+            lambda: fetch_page(engine, flt, cursor=cursor),
+        )
+    except Exception as e:
+        st.error(f"Failed to load data: {e}")
+        st.stop()
+
+    # RESULTS
+    page_no = len(st.session_state.rd_cursors)
+    st.markdown(f"### **{total:,} records found**")
+    st.dataframe(page_df, use_container_width=True)
+
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Previous", disabled=page_no == 1, use_container_width=True):
+            st.session_state.rd_cursors.pop()
+            st.rerun()
+    with info_col:
+        pages = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+        st.caption(f"Page {page_no} of {pages:,} • {PAGE_SIZE} rows per page")
+    with next_col:
+        if st.button("Next →", disabled=next_cursor is None, use_container_width=True):
+            st.session_state.rd_cursors.append(next_cursor)
+            st.rerun()
+
+    st.markdown("---")
+
+    # ====== DATASET DOWNLOAD (streamed in chunks, never fully loaded into pandas) ======
+    export_format = st.radio("Export format", list(FORMATS), horizontal=True)
+    extension, mime = FORMATS[export_format]
+
+    if st.button("Generate & Download", type="primary", use_container_width=True):
+        try:
+            statement, params = export_statement(flt)
+            with st.spinner(f"Exporting {total:,} records..."):
+                output = export_query(engine, statement, params, fmt=extension)
+
+            st.download_button(
+                label=f"Download Filtered Dataset.{extension}",
+                data=output,
+                file_name=f"Abia_Education_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.{extension}",
+                mime=mime
+            )
+
+            st.success("Your custom dataset is ready!")
+            st.balloons()
+
+        except Exception as e:
+            st.error(f"Failed to generate export file: {e}")
@@ -0,0 +1,231 @@
+"""Submit Data: school form with proof photo, email verification code, then the insert."""
+import json
+import random
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+
+from portal.aggregates import add_submission_counts
+from portal.facilities import FACILITY_OPTIONS, encode_facilities
+from portal.images import InvalidImage, ingest_photo
+from portal.querylog import execute
+from portal.schools import name_key_sql
+from views.common import get_lgas, send_email
+
+
+def save_submission(engine, school, lga, students, teachers, name, email, facilities, photo_path, thumb_path=None):
+    if not engine:
+        return False
+    try:
+        with engine.begin() as conn:
+            # lga_key and the school (LGA + normalized name) are resolved here; the
+            # submission is appended to the school's history (portal/schools.py)
+            result = execute("submissions.insert", conn, text(f"""
+                WITH lga AS (
+                    SELECT lga_key, lga_name FROM dwh.dim_lga WHERE lga_name = :lga
+                ),
+                school AS (
+                    INSERT INTO schools (lga_key, name_key, school_name)
+                    SELECT lga_key, {name_key_sql("CAST(:school AS TEXT)")}, :school FROM lga
+                    ON CONFLICT (lga_key, name_key) DO UPDATE SET updated_at = NOW()
+                    RETURNING id, lga_key, (xmax = 0) AS created  -- xmax = 0 only for freshly inserted rows
+                )
+                INSERT INTO school_submissions 
+                (school_id, school_name, lga_name, lga_key, enrollment_total, teachers_total, 
+                 submitted_by, email, facilities, facilities_mask, photo_path, thumb_path, submitted_at, approved)
+                SELECT school.id, :school, l.lga_name, l.lga_key, :students, :teachers, :name, :email, 
+                       CAST(:facilities AS JSONB), :facilities_mask, :photo_path, :thumb_path, NOW(), NULL
+                FROM lga l
+                JOIN school ON school.lga_key = l.lga_key
+                RETURNING lga_key, (SELECT created FROM school) AS new_school
+            """), {
+                "school": school,
+                "lga": lga,
+                "students": students,
+                "teachers": teachers,
+                "name": name,
+                "email": email,
+                "facilities": json.dumps(list(facilities)),
+                "facilities_mask": encode_facilities(facilities),  # used by all rollups
+                "photo_path": photo_path,
+                "thumb_path": thumb_path
+            })
+            row = result.first()
+            if row is None:
+                st.error(f"Unknown LGA: {lga}")
+                return False
+            if row.new_school:
+                add_submission_counts(conn, {row.lga_key: 1})  # feeds the ranking's verification rate
+        return True
+    except Exception as e:
+        st.error(f"Database error: {e}")
+        return False
+
+
+def render(engine):
+    st.markdown("### Submit School Data")
+    st.info("Your official school email is required • All submissions are verified and approved by admin")
+
+    # ==================== SECURITY: RATE LIMIT (2 MINUTES) ====================
+    if "last_submission_time" not in st.session_state:
+        st.session_state.last_submission_time = 0
+
+    current_time = pd.Timestamp.now().timestamp()
+    time_since_last = current_time - st.session_state.last_submission_time
+
+    if time_since_last < 120:  # 120 seconds = 2 minutes
+        remaining = int(120 - time_since_last)
+        st.error(f"Too many attempts. Please wait **{remaining} seconds** before submitting again.")
+        st.stop()
+
+    # =====================================================================
+    # Load LGAs
+    if engine:
+        try:
+            lgas = get_lgas()['lga_name'].tolist()
+        except Exception as e:
+            lgas = []
+            st.error(f"Could not load LGAs: {e}")
+    else:
+        lgas = []
+        st.error("Database not connected.")
+
+    if not lgas:
+        st.stop()
+
+    # ============= STEP 1: Fill Form & Send Verification Code =============
+    if not st.session_state.get("awaiting_code", False):
+        with st.form("send_code_form", clear_on_submit=False):
+            st.markdown("#### School & Contact Information")
+            col1, col2 = st.columns(2)
+            with col1:
+                school = st.text_input("School Name *", placeholder="e.g. Community Secondary School Ohafia")
+                lga = st.selectbox("LGA *", options=lgas)
+                name = st.text_input("Contact Name * (Principal/Head Teacher)", placeholder="e.g. Mrs. Chioma Okeke")
+            with col2:
+                students = st.number_input("Total Students Enrolled *", min_value=1, step=1)
+                teachers = st.number_input("Total Teachers *", min_value=1, step=1)
+                email = st.text_input("Official School Email *", placeholder="principal.school@abiaschools.edu.ng")
+
+            st.markdown("#### Functional Facilities (Select all that work)")
+            facilities = st.multiselect(
+                "Check all facilities currently working",
+                FACILITY_OPTIONS,
+                help="This helps government know where to send help first"
+            )
+
+            st.markdown("#### Upload Proof Photo * (School signboard or front gate)")
+            photo = st.file_uploader(
+                "Clear photo required — prevents fake schools",
+                type=['jpg', 'jpeg', 'png'],
+                help="Take a photo of the school signboard or building entrance"
+            )
+
+            submit_btn = st.form_submit_button("Send Verification Code", type="primary")
+
+            if submit_btn:
+                errors = []
+                if not school.strip(): errors.append("School name required")
+                if not lga: errors.append("LGA required")
+                if not name.strip(): errors.append("Contact name required")
+                if not email or "@" not in email: errors.append("Valid email required")
+                if students < 1 or teachers < 1: errors.append("Student/teacher count must be positive")
+                if not photo: errors.append("Photo is mandatory")
+                if not errors:
+                    # Validate, orient, strip metadata, downsize + thumbnail, then store
+                    # content-addressed (portal/images.py, portal/blobstore.py)
+                    try:
+                        photo_path, thumb_path = ingest_photo(photo.getvalue())
+                    except InvalidImage as e:
+                        errors.append(f"Photo rejected: {e}")
+
+                if not errors:
+                    # Store in session
+                    st.session_state.temp_data = {
+                        "school": school.strip(),
+                        "lga": lga,
+                        "students": int(students),
+                        "teachers": int(teachers),
+                        "name": name.strip(),
+                        "email": email.strip().lower(),
+                        "facilities": facilities,
+                        "photo_path": photo_path,
+                        "thumb_path": thumb_path
+                    }
+
+                    # Send code
+                    code = random.randint(100000, 999999)
+                    body = f"""
+Hello {name},
+
+Thank you for submitting data for **{school}**, {lga} LGA.
+
+Your 6-digit verification code is:
+
+**{code}**
+
+Enter it on the portal to complete submission.
+
+This ensures only real schools submit data.
+
+— Abia State Education Portal Team
+                    """
+                    if send_email(email, "Your Abia Portal Verification Code", body):
+                        st.session_state.verification_code = code
+                        st.session_state.awaiting_code = True
+                        st.success(f"Code sent to {email}")
+                        st.balloons()
+                        st.rerun()
+                    else:
+                        st.error("Failed to send email. Check address and try again.")
+                else:
+                    for error in errors:
+                        st.error(error)
+
+    # ============= STEP 2: Enter Code & Final Submit =============
+    else:
+        temp = st.session_state.temp_data
+        st.info(f"Verification code sent to **{temp['email']}** • School: **{temp['school']}**")
+
+        with st.form("verify_code_form"):
+            code_input = st.text_input("Enter 6-digit code", max_chars=6, placeholder="e.g. 283749")
+            verify_btn = st.form_submit_button("Verify & Submit", type="primary")
+
+            if verify_btn:
+                if code_input == str(st.session_state.verification_code):
+                    success = save_submission(
+                        engine,
+                        school=temp["school"],
+                        lga=temp["lga"],
+                        students=temp["students"],
+                        teachers=temp["teachers"],
+                        name=temp["name"],
+                        email=temp["email"],
+                        facilities=temp["facilities"],
+                        photo_path=temp["photo_path"],
+                        thumb_path=temp.get("thumb_path")
+                    )
+
+                    if success:
+                        # Success email
+                        send_email(
+                            temp["email"],
+                            "Submission Received – Abia Education Portal",
+                            f"Hello {temp['name']},\n\nYour data for **{temp['school']}** has been received and is pending approval.\n\nYou will be notified when it's live.\n\nThank you!\n— Abia Education Portal"
+                        )
+
+                        st.success("Submitted successfully! Your data is now pending admin approval.")
+                        st.balloons()
+
+                        # === UPDATE RATE LIMIT TIMER ===
+                        st.session_state.last_submission_time = pd.Timestamp.now().timestamp()
+
+                        # Clear session
+                        for key in ["temp_data", "verification_code", "awaiting_code"]:
+                            st.session_state.pop(key, None)
+                        st.rerun()
+                    else:
+                        st.error("Failed to save. Please try again later.")
+                else:
+                    st.error("Incorrect code. Check and try again.")